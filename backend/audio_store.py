@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Awaitable, Callable, Dict
+
+from cache import Coalescer
+
+
+class AudioStore:
+    """Content-addressed store for synthesized audio with size-bounded LRU eviction"""
+
+    def __init__(self, directory: str = "static/audio", max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, dict] = {}
+        self._syntheses = Coalescer()
+        self._dirty = False
+        self._manifest_lock = asyncio.Lock()
+        self._load()
+
+    def _load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path) as f:
+                entries = json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable audio manifest: {str(e)}")
+            return
+        # Files removed behind our back are forgotten
+        self._entries = {
+            key: entry for key, entry in entries.items()
+            if os.path.exists(os.path.join(self.directory, entry["file"]))
+        }
+
+    def _write_manifest(self, entries: Dict[str, dict]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    async def flush(self):
+        """Persist the manifest, including last-used times updated by hits"""
+        async with self._manifest_lock:
+            if self._dirty:
+                self._dirty = False
+                await asyncio.to_thread(self._write_manifest, dict(self._entries))
+
+    @staticmethod
+    def key(text: str, voice_id: str, model_id: str, voice_settings: dict) -> str:
+        canonical = json.dumps(
+            {"text": text, "voice_id": voice_id, "model_id": model_id, "voice_settings": voice_settings},
+            sort_keys=True
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._entries.values())
+
+    def _evict(self, keep: str):
+        total = self.total_bytes
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, entry["file"]))
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            del self._entries[key]
+
+    async def get_or_create(
+        self,
+        text: str,
+        voice_id: str,
+        model_id: str,
+        voice_settings: dict,
+        synthesize: Callable[[str], Awaitable]
+    ) -> str:
+        """Return the filename for this synthesis, calling synthesize(path) only on a miss"""
+        key = self.key(text, voice_id, model_id, voice_settings)
+        entry = self._entries.get(key)
+        if entry is not None and os.path.exists(os.path.join(self.directory, entry["file"])):
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._dirty = True
+            return entry["file"]
+
+        async def create():
+            filename = f"tts_{key}.mp3"
+            path = os.path.join(self.directory, filename)
+            await synthesize(path)
+            now = time.time()
+            self._entries[key] = {"file": filename, "size": os.path.getsize(path), "created_at": now, "last_used": now}
+            self._evict(keep=key)
+            self._dirty = True
+            await self.flush()
+            return filename
+
+        # A request that disconnects mid-synthesis leaves it running for the others
+        if key in self._syntheses:
+            self.hits += 1
+        else:
+            self.misses += 1
+        filename, _ = await self._syntheses.run(key, create)
+        return filename
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes
+        }
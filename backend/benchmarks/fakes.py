@@ -0,0 +1,393 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+
+from creator_metrics import normalize_creator
+
+PLATFORMS = ["Instagram", "YouTube", "TikTok", "Twitter", "LinkedIn"]
+CATEGORIES = ["Fashion", "Beauty", "Tech", "Food", "Travel", "Fitness", "Gaming", "Finance", "Parenting", "Music"]
+LOCATIONS = ["Mumbai", "Delhi", "Bangalore", "Chennai", "Pune", "Hyderabad", "Kolkata", "Jaipur"]
+
+
+class FakeResult:
+    def __init__(self, data: List[dict], count: Optional[int] = None):
+        self.data = data
+        self.count = count
+
+
+def _split_top_level(expr: str) -> List[str]:
+    parts, depth, quoted, current = [], 0, False, ""
+    for i, char in enumerate(expr):
+        if char == '"' and (i == 0 or expr[i - 1] != "\\"):
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _unquote(value: str):
+    if value.startswith('"') and value.endswith('"'):
+        return value[1:-1].replace('\\"', '"')
+    for number in (int, float):
+        try:
+            return number(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _compare(op: str, left, right) -> bool:
+    if left is None:
+        return False
+    if isinstance(right, str):
+        left = str(left)
+    return {
+        "eq": left == right,
+        "neq": left != right,
+        "gt": left > right,
+        "gte": left >= right,
+        "lt": left < right,
+        "lte": left <= right
+    }[op]
+
+
+def _sort_value(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value, "")
+    return (1, 0, str(value))
+
+
+def _parse_or(expr: str):
+    """PostgREST or=(...) filters, enough of the grammar for keyset cursors"""
+    clauses = []
+    for part in _split_top_level(expr):
+        if part.startswith("and(") and part.endswith(")"):
+            inner = [_parse_or(p) for p in _split_top_level(part[4:-1])]
+            clauses.append(lambda row, inner=inner: all(f(row) for f in inner))
+        else:
+            column, op, value = part.split(".", 2)
+            if op == "ilike":
+                # Inside or= PostgREST takes * as the wildcard
+                regex = re.compile("^" + ".*".join(re.escape(p) for p in value.split("*")) + "$", re.IGNORECASE | re.DOTALL)
+                clauses.append(lambda row, c=column, r=regex: r.match(str(row.get(c) or "")) is not None)
+                continue
+            clauses.append(lambda row, c=column, o=op, v=_unquote(value): _compare(o, row.get(c), v))
+    return lambda row: any(f(row) for f in clauses)
+
+
+class FakeQuery:
+    """The subset of the PostgREST query builder that the backend uses"""
+
+    def __init__(self, store: "FakeSupabase", table: str):
+        self.store = store
+        self.table = table
+        self.operation = "select"
+        self.columns = "*"
+        self.count = None
+        self.payload = None
+        self.filters = []
+        self.ordering = []
+        self.row_limit = None
+        self._negate = False
+
+    def select(self, columns: str = "*", count: Optional[str] = None):
+        self.columns = columns
+        self.count = count
+        return self
+
+    def insert(self, payload):
+        self.operation, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict: str = "id", **kwargs):
+        self.operation, self.payload = "upsert", payload
+        self.conflict = on_conflict.split(",")
+        return self
+
+    def update(self, payload: dict):
+        self.operation, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.operation = "delete"
+        return self
+
+    def _filter(self, op: str, column: str, value):
+        self.filters.append(lambda row: _compare(op, row.get(column), value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter("eq", column, value)
+
+    def neq(self, column, value):
+        return self._filter("neq", column, value)
+
+    def gt(self, column, value):
+        return self._filter("gt", column, value)
+
+    def gte(self, column, value):
+        return self._filter("gte", column, value)
+
+    def lt(self, column, value):
+        return self._filter("lt", column, value)
+
+    def lte(self, column, value):
+        return self._filter("lte", column, value)
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def ilike(self, column, pattern: str):
+        regex = re.compile("^" + ".*".join(re.escape(p) for p in pattern.split("%")) + "$", re.IGNORECASE | re.DOTALL)
+        self.filters.append(lambda row: regex.match(str(row.get(column) or "")) is not None)
+        return self
+
+    def is_(self, column, value):
+        # Only the null check is used; not_ flips it
+        negate, self._negate = self._negate, False
+        self.filters.append(lambda row: (row.get(column) is None) != negate)
+        return self
+
+    @property
+    def not_(self):
+        self._negate = True
+        return self
+
+    def contains(self, column, values):
+        self.filters.append(lambda row: all(v in (row.get(column) or []) for v in values))
+        return self
+
+    def or_(self, expr: str):
+        self.filters.append(_parse_or(expr))
+        return self
+
+    def order(self, column, desc: bool = False):
+        self.ordering.append((column, desc))
+        return self
+
+    def limit(self, count: int):
+        self.row_limit = count
+        return self
+
+    def _project(self, row: dict) -> dict:
+        if self.columns == "*":
+            return dict(row)
+        return {c: row.get(c) for c in self.columns.split(",")}
+
+    async def execute(self) -> FakeResult:
+        await asyncio.sleep(self.store.latency)
+        rows = self.store.tables.setdefault(self.table, [])
+
+        if self.operation in ("insert", "upsert"):
+            payload = self.payload if isinstance(self.payload, list) else [self.payload]
+            written = [{"id": str(uuid.uuid4()), **item} for item in payload]
+            if self.operation == "upsert":
+                key = lambda row: tuple(row.get(c) for c in self.conflict)
+                replaced = {key(item) for item in written}
+                rows[:] = [r for r in rows if key(r) not in replaced]
+            rows.extend(written)
+            return FakeResult([dict(item) for item in written])
+
+        matched = [r for r in rows if all(f(r) for f in self.filters)]
+        if self.operation == "update":
+            for row in matched:
+                row.update(self.payload)
+            return FakeResult([dict(r) for r in matched])
+        if self.operation == "delete":
+            removed = {id(r) for r in matched}
+            self.store.tables[self.table] = [r for r in rows if id(r) not in removed]
+            return FakeResult([dict(r) for r in matched])
+
+        for column, desc in reversed(self.ordering):
+            # Numbers order numerically, like the numeric metric columns in Postgres
+            matched.sort(key=lambda r: (r.get(column) is None, _sort_value(r.get(column))), reverse=desc)
+        count = len(matched) if self.count else None
+        if self.row_limit is not None:
+            matched = matched[:self.row_limit]
+        return FakeResult([self._project(r) for r in matched], count)
+
+
+class FakeSupabase:
+    """In-memory table store standing in for the Supabase client"""
+
+    def __init__(self, latency: float = 0.005):
+        self.latency = latency
+        self.tables: Dict[str, List[dict]] = {}
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def seed(self, creators: int = 1000, campaigns: int = 20, deals: int = 50, seed: int = 7):
+        """Fill the tables with a deterministic synthetic roster"""
+        rng = random.Random(seed)
+        self.tables["creators"] = [
+            normalize_creator({
+                "id": f"creator-{i:05d}",
+                "name": f"Creator {i}",
+                "handle": f"@creator{i}",
+                "platform": rng.choice(PLATFORMS),
+                "followers": f"{rng.randint(5, 900)}K",
+                "engagement": f"{rng.uniform(0.5, 9.5):.1f}%",
+                "category": rng.choice(CATEGORIES),
+                "location": rng.choice(LOCATIONS),
+                "description": f"{rng.choice(CATEGORIES)} and {rng.choice(CATEGORIES).lower()} content for a young urban audience"
+            })
+            for i in range(creators)
+        ]
+        self.tables["campaigns"] = [
+            {
+                "id": f"campaign-{i:03d}",
+                "title": f"{rng.choice(CATEGORIES)} launch {i}",
+                "brief": "Promote our new product line with authentic short-form content",
+                "platforms": rng.sample(PLATFORMS, 2),
+                "audience": "18-30 year olds in metro cities",
+                "budget": str(rng.randint(50, 500) * 1000),
+                "enhanced_brief": None,
+                "created_at": f"2024-01-{i % 28 + 1:02d}T00:00:00"
+            }
+            for i in range(campaigns)
+        ]
+        self.tables["deals"] = [
+            {
+                "id": f"deal-{i:04d}",
+                "campaign_id": f"campaign-{i % campaigns:03d}",
+                "creator_id": f"creator-{i:05d}",
+                "rate": f"{rng.randint(10, 200) * 1000} INR",
+                "deliverables": "2 reels, 3 stories",
+                "platform": rng.choice(PLATFORMS),
+                "timeline": "4 weeks",
+                "status": "finalized",
+                "created_at": "2024-02-01T00:00:00"
+            }
+            for i in range(deals)
+        ]
+
+
+class FakeOpenAI:
+    """httpx transport answering chat completions and embeddings with canned JSON"""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, embedding_dim: int = 256, seed: int = 7):
+        self.latency = latency
+        self.jitter = jitter
+        self.embedding_dim = embedding_dim
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def _sleep(self):
+        await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+    def _completion(self, body: dict) -> str:
+        system = " ".join(m["content"] for m in body["messages"] if m["role"] == "system")
+        prompt = body["messages"][-1]["content"]
+        if "influencer analytics" in system:
+            count = len(re.findall(r"Creator \d+:", prompt))
+            return json.dumps({
+                "creator_scores": [
+                    {
+                        "creator_index": i,
+                        "match_score": self.rng.randint(40, 98),
+                        "strengths": ["audience fit", "engagement"],
+                        "collaboration_fit": "good",
+                        "growth_potential": "medium",
+                        "optimal_content_types": ["reels"]
+                    }
+                    for i in range(count)
+                ],
+                "semantic_matches": ["lifestyle", "urban", "launch"]
+            })
+        if "Always return valid JSON" in system:
+            return json.dumps({
+                "email_content": "Subject: Collaboration\n\nHi there, we would love to work with you. Thank you!",
+                "voice_script": "Hi! We loved your recent content and would like to invite you to our campaign."
+            })
+        return "This is a synthetic response used for offline benchmarking."
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await self._sleep()
+        if request.url.path.endswith("/audio/transcriptions"):
+            # Multipart upload; the transcript only reports how much audio arrived
+            return httpx.Response(200, json={"text": f"Synthetic transcript of {len(request.content)} bytes of audio."})
+        body = json.loads(request.content)
+        if request.url.path.endswith("/embeddings"):
+            inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+            data = []
+            for i, text in enumerate(inputs):
+                rng = random.Random(hashlib.sha256(text.encode()).digest())
+                data.append({"object": "embedding", "index": i, "embedding": [rng.gauss(0, 1) for _ in range(self.embedding_dim)]})
+            tokens = sum(len(t.split()) for t in inputs)
+            return httpx.Response(200, json={
+                "object": "list",
+                "data": data,
+                "model": body["model"],
+                "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+            })
+        if request.url.path.endswith("/chat/completions"):
+            if body.get("stream"):
+                return httpx.Response(501, json={"error": {"message": "Streaming is not faked"}})
+            content = self._completion(body)
+            prompt_tokens = sum(len(m["content"].split()) for m in body["messages"])
+            return httpx.Response(200, json={
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(content.split()),
+                    "total_tokens": prompt_tokens + len(content.split())
+                }
+            })
+        return httpx.Response(404, json={"error": {"message": f"No fake for {request.url.path}"}})
+
+
+# One silent 128 kbps / 44.1 kHz MPEG-1 Layer III frame (~26 ms of audio)
+MP3_FRAME = b"\xff\xfb\x90\x64" + bytes(413)
+
+
+class FakeElevenLabs:
+    """httpx transport streaming synthetic MP3 frames, roughly sized to the text"""
+
+    def __init__(self, latency: float = 0.3, chunk_delay: float = 0.01, chars_per_second: float = 15.0):
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.chars_per_second = chars_per_second
+        self.requests = 0
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        body = json.loads(request.content)
+        await asyncio.sleep(self.latency)
+        frames = max(1, int(len(body["text"]) / self.chars_per_second / 0.026))
+
+        async def audio():
+            # About a second of audio per chunk
+            for start in range(0, frames, 38):
+                await asyncio.sleep(self.chunk_delay)
+                yield MP3_FRAME * min(38, frames - start)
+
+        return httpx.Response(200, headers={"content-type": "audio/mpeg"}, content=audio())
@@ -0,0 +1,233 @@
+"""Offline load test of the API against in-process Supabase, OpenAI and ElevenLabs fakes.
+
+Run from backend/:  python -m benchmarks.run --scenario search --concurrency 16 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.fakes import FakeElevenLabs, FakeOpenAI, FakeSupabase
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("search", "outreach", "batch", "contract")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a sleeping task"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def take(self) -> List[float]:
+        samples, self.samples = self.samples, []
+        return samples
+
+
+def build_requests(args, store: FakeSupabase) -> Dict[str, Callable[[int], Tuple[str, str, dict]]]:
+    campaigns = [c["id"] for c in store.tables["campaigns"]]
+    creators = [c["id"] for c in store.tables["creators"]]
+    deals = [d["id"] for d in store.tables["deals"]]
+
+    def vary(i: int) -> int:
+        # Warm runs repeat one payload so the caches answer; cold runs never repeat
+        return 0 if args.warm else i
+
+    def search(i):
+        query = "fitness creators for a product launch" + ("" if args.warm else f" #{i}")
+        return "POST", "/api/creators/search", {"json": {"query": query, "campaign_id": campaigns[vary(i) % len(campaigns)]}}
+
+    def outreach(i):
+        return "POST", "/api/outreach", {"json": {
+            "campaign_id": campaigns[vary(i) % len(campaigns)],
+            "creator_id": creators[vary(i) % len(creators)]
+        }}
+
+    def batch(i):
+        start = vary(i) * args.batch_size % len(creators)
+        return "POST", "/api/outreach/batch", {
+            "params": {"campaign_id": campaigns[vary(i) % len(campaigns)]},
+            "json": [creators[(start + j) % len(creators)] for j in range(args.batch_size)]
+        }
+
+    def contract(i):
+        return "POST", "/api/contracts/generate", {"json": {"deal_id": deals[vary(i) % len(deals)]}}
+
+    return {"search": search, "outreach": outreach, "batch": batch, "contract": contract}
+
+
+async def drive(client: httpx.AsyncClient, build: Callable, total: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    indices = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for i in indices:
+            method, url, kwargs = build(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def summarize(name: str, run: dict, lag: List[float], concurrency: int) -> dict:
+    ms = lambda seconds: round(seconds * 1000, 2)
+    latencies = run["latencies"]
+    return {
+        "scenario": name,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": run["errors"],
+        "throughput_rps": round(len(latencies) / run["elapsed"], 2) if run["elapsed"] else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(max(latencies, default=0.0)),
+        "loop_lag_p50_ms": ms(percentile(lag, 50)),
+        "loop_lag_p99_ms": ms(percentile(lag, 99)),
+        "loop_lag_max_ms": ms(max(lag, default=0.0))
+    }
+
+
+def print_table(rows: List[dict]):
+    columns = [
+        ("scenario", "scenario"), ("requests", "reqs"), ("errors", "errs"), ("throughput_rps", "req/s"),
+        ("p50_ms", "p50 ms"), ("p95_ms", "p95 ms"), ("p99_ms", "p99 ms"), ("max_ms", "max ms"),
+        ("loop_lag_p99_ms", "lag p99 ms"), ("loop_lag_max_ms", "lag max ms")
+    ]
+    widths = [max(len(title), *(len(str(row[key])) for row in rows)) for key, title in columns]
+    print("  ".join(title.rjust(width) for (_, title), width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[key]).rjust(width) for (key, _), width in zip(columns, widths)))
+
+
+def prepare_environment(workdir: str):
+    """Point the app at a scratch directory and dummy credentials before it is imported"""
+    os.makedirs(os.path.join(workdir, "static", "audio"), exist_ok=True)
+    os.makedirs(os.path.join(workdir, "static", "contracts"), exist_ok=True)
+    os.chdir(workdir)
+    # Set explicitly so a developer .env can never send benchmark traffic to real services
+    os.environ.update({
+        "OPENAI_API_KEY": "bench",
+        "ELEVENLABS_API_KEY": "bench",
+        "SUPABASE_URL": "http://supabase.invalid",
+        "SUPABASE_KEY": "bench"
+    })
+    for name in ("SEARCH_CACHE_PATH", "LLM_MEMO_PATH", "JOB_STORE_PATH"):
+        os.environ.pop(name, None)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+
+
+async def run(args) -> List[dict]:
+    import main as backend
+    from openai import AsyncOpenAI
+
+    store = FakeSupabase(latency=args.db_latency)
+    store.seed(creators=args.creators)
+    openai = FakeOpenAI(latency=args.llm_latency, jitter=args.llm_jitter)
+    elevenlabs = FakeElevenLabs(latency=args.tts_latency)
+
+    backend.db.use(store)
+    backend.llm.client = AsyncOpenAI(
+        api_key="bench",
+        base_url="http://openai.invalid/v1",
+        http_client=httpx.AsyncClient(transport=openai.transport()),
+        max_retries=0
+    )
+    backend.tts._http = httpx.AsyncClient(base_url="http://elevenlabs.invalid/v1", transport=elevenlabs.transport())
+
+    await backend.startup()
+    builders = build_requests(args, store)
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    if "search" in scenarios:
+        # Index builds are a one-off cost, not part of steady-state latency
+        await backend.ensure_creator_index()
+        await backend.ensure_keyword_index()
+
+    monitor = LoopLagMonitor(args.lag_interval)
+    monitor.start()
+    rows = []
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for name in scenarios:
+            monitor.take()
+            result = await drive(client, builders[name], args.requests, args.concurrency)
+            rows.append(summarize(name, result, monitor.take(), args.concurrency))
+    await monitor.stop()
+    await backend.shutdown()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--creators", type=int, default=1000, help="size of the synthetic roster")
+    parser.add_argument("--batch-size", type=int, default=10, help="creators per batch outreach request")
+    parser.add_argument("--warm", action="store_true", help="repeat one payload so caches are exercised")
+    parser.add_argument("--db-latency", type=float, default=0.005, help="seconds per fake Supabase call")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="seconds per fake OpenAI call")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--tts-latency", type=float, default=0.3, help="seconds before fake audio starts")
+    parser.add_argument("--lag-interval", type=float, default=0.01, help="event-loop lag sampling period")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="creatorflow-bench-") as workdir:
+        cwd = os.getcwd()
+        prepare_environment(workdir)
+        try:
+            rows = asyncio.run(run(args))
+        finally:
+            os.chdir(cwd)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+from typing import Dict, Optional, Set
+
+from metrics import REGISTRY, Counter, Gauge
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+SUBSCRIBERS = REGISTRY.register(Gauge(
+    "broker_subscribers", "Live channel subscriptions held by this worker"
+))
+PUBLISHED = REGISTRY.register(Counter(
+    "broker_messages_published_total", "Messages published to channels"
+))
+DROPPED = REGISTRY.register(Counter(
+    "broker_subscribers_dropped_total", "Subscribers disconnected because their queue filled up"
+))
+
+
+class Subscription:
+    """A bounded queue of messages for one subscriber of one channel
+
+    A subscriber that falls max_queue messages behind is marked overflowed and
+    receives nothing more, so one slow client never holds up a publisher.
+    """
+
+    def __init__(self, broker: "InMemoryBroker", channel: str, max_queue: int):
+        self.broker = broker
+        self.channel = channel
+        self.overflowed = False
+        self._queue: asyncio.Queue = asyncio.Queue(max_queue)
+
+    def offer(self, message: dict):
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The reader is busy sending, so it finds a full queue and stops at its next get()
+            self.overflowed = True
+            DROPPED.inc()
+
+    async def get(self) -> Optional[dict]:
+        """Next message, or None once the subscriber has overflowed"""
+        message = await self._queue.get()
+        return None if self.overflowed else message
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.broker.unsubscribe(self)
+
+
+class InMemoryBroker:
+    """Channel fan-out within this process"""
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._channels: Dict[str, Set[Subscription]] = {}
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    def subscribe(self, channel: str) -> Subscription:
+        subscription = Subscription(self, channel, self.max_queue)
+        self._channels.setdefault(channel, set()).add(subscription)
+        SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._channels.get(subscription.channel)
+        if subscribers is None or subscription not in subscribers:
+            return
+        subscribers.discard(subscription)
+        SUBSCRIBERS.dec()
+        if not subscribers:
+            del self._channels[subscription.channel]
+
+    def deliver(self, channel: str, message: dict):
+        """Hand a message to this process's subscribers of channel"""
+        for subscription in list(self._channels.get(channel, ())):
+            subscription.offer(message)
+
+    async def publish(self, channel: str, message: dict):
+        PUBLISHED.inc()
+        self.deliver(channel, message)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "channels": len(self._channels),
+            "subscribers": sum(len(s) for s in self._channels.values()),
+            "max_queue": self.max_queue
+        }
+
+
+class RedisBroker(InMemoryBroker):
+    """Redis pub/sub between workers, with local fan-out to each worker's subscribers"""
+
+    def __init__(self, url: str, prefix: str = "creatorflow:", max_queue: int = 100):
+        super().__init__(max_queue)
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self._client is not None:
+            return
+        self._client = redis.from_url(self.url)
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        # One pattern subscription per worker; messages for channels nobody here watches are ignored
+        await pubsub.psubscribe(f"{self.prefix}*")
+        self._listener = asyncio.create_task(self._listen(pubsub))
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _listen(self, pubsub):
+        try:
+            while True:
+                try:
+                    async for item in pubsub.listen():
+                        channel = item["channel"].decode()[len(self.prefix):]
+                        self.deliver(channel, json.loads(item["data"]))
+                except (asyncio.CancelledError, GeneratorExit):
+                    raise
+                except Exception as e:
+                    print(f"Redis broker listener error, reconnecting: {str(e)}")
+                    await asyncio.sleep(1)
+                    await pubsub.psubscribe(f"{self.prefix}*")
+        finally:
+            await pubsub.aclose()
+
+    async def publish(self, channel: str, message: dict):
+        PUBLISHED.inc()
+        # Delivered back to this worker by the listener, like every other worker
+        await self._client.publish(f"{self.prefix}{channel}", json.dumps(message, default=str))
+
+    def stats(self) -> dict:
+        return {**super().stats(), "backend": "redis"}
+
+
+def create_broker(url: Optional[str], max_queue: int = 100) -> InMemoryBroker:
+    """Redis broker for a redis:// URL, otherwise in-process fan-out"""
+    if url and url.startswith(("redis://", "rediss://")):
+        if redis is None:
+            print("BROKER_URL is set but the redis package is not installed; using the in-process broker")
+        else:
+            return RedisBroker(url, max_queue=max_queue)
+    return InMemoryBroker(max_queue)
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+MISSING = object()
+
+
+class CacheStats:
+    """Hit/miss counters plus the time hits saved over recomputing"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def to_dict(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3)
+        }
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a TTL"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, default=MISSING):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return default
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        self._entries[key] = (value, time.monotonic() + (ttl or self.ttl))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        for key in [k for k in self._entries if k.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+class SQLiteCache:
+    """JSON values in a local SQLite file with per-entry expiry; survives restarts"""
+
+    def __init__(self, path: str, ttl: float = 300.0):
+        self.path = path
+        self.ttl = ttl
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def get(self, key: str, default=MISSING):
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return default
+        return json.loads(row[0])
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, default=str), time.time() + (ttl or self.ttl))
+            )
+
+    def delete(self, key: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache")
+
+
+class TieredCache:
+    """In-memory TTL/LRU tier in front of an optional SQLite disk tier"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 300.0, path: Optional[str] = None):
+        self.memory = TTLCache(max_entries, ttl)
+        self.disk = SQLiteCache(path, ttl) if path else None
+        self.stats = CacheStats()
+        # Seconds each cached value took to compute, credited as saved on a hit
+        self._costs = TTLCache(max_entries, ttl)
+
+    async def get(self, key: str, default=None) -> Any:
+        value = self.memory.get(key)
+        if value is MISSING and self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not MISSING:
+                self.memory.set(key, value)
+        if value is MISSING:
+            self.stats.misses += 1
+            return default
+        self.stats.hits += 1
+        self.stats.saved_seconds += self._costs.get(key, 0.0)
+        return value
+
+    async def set(self, key: str, value, cost: float = 0.0, ttl: Optional[float] = None):
+        self.memory.set(key, value, ttl)
+        self._costs.set(key, cost, ttl)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, ttl)
+
+    async def delete(self, key: str):
+        self.memory.delete(key)
+        self._costs.delete(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
+
+    async def delete_prefix(self, prefix: str):
+        self.memory.delete_prefix(prefix)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete_prefix, prefix)
+
+    async def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.clear)
+
+
+class Coalescer:
+    """Runs at most one load per key; callers that arrive meanwhile share its result
+
+    The load runs in a task owned here rather than by the caller that started it,
+    so a cancelled caller only stops waiting and the others still get the result.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Retrieved so a load nobody waits for any more does not log "never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def run(self, key: Hashable, load: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """Return (result, whether it came from a load another caller started)"""
+        task = self._tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await asyncio.shield(task), shared
+
+
+class EntityCache:
+    """Read-through cache for single rows with per-entity TTLs and coalesced misses"""
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1024):
+        self._caches = {entity: TTLCache(max_entries, ttl) for entity, ttl in ttls.items()}
+        self.stats = {entity: CacheStats() for entity in ttls}
+        self._loads = Coalescer()
+        # Keys invalidated while a load was in flight; that load must not store its row
+        self._stale: Set[Tuple[str, str]] = set()
+
+    async def get(self, entity: str, key: str, load: Callable[[], Awaitable]):
+        cache = self._caches[entity]
+        value = cache.get(key)
+        if value is not MISSING:
+            self.stats[entity].hits += 1
+            return dict(value)
+
+        async def load_and_store():
+            self._stale.discard((entity, key))
+            loaded = await load()
+            if (entity, key) in self._stale:
+                self._stale.discard((entity, key))
+            elif loaded is not None:
+                cache.set(key, loaded)
+            return loaded
+
+        # A coalesced caller saves a round-trip, so it counts as a hit
+        if (entity, key) in self._loads:
+            self.stats[entity].hits += 1
+        else:
+            self.stats[entity].misses += 1
+        value, _ = await self._loads.run((entity, key), load_and_store)
+        return dict(value) if value is not None else None
+
+    def set(self, entity: str, key: str, value: dict):
+        self._caches[entity].set(key, dict(value))
+
+    def invalidate(self, entity: str, key: str):
+        self._caches[entity].delete(key)
+        if (entity, key) in self._loads:
+            self._stale.add((entity, key))
+
+    def to_dict(self) -> dict:
+        return {
+            entity: {**self.stats[entity].to_dict(), "entries": len(cache)}
+            for entity, cache in self._caches.items()
+        }
@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import string
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from cache import Coalescer
+
+FONT_NAME = "Helvetica"
+FONT_SIZE = 12
+LEADING = 15
+MARGIN = 50
+
+
+CONTRACT_TEMPLATE = """
+    INFLUENCER MARKETING AGREEMENT
+
+    Campaign: {campaign.title}
+    Platform: {deal.platform}
+    Rate: {deal.rate}
+    Deliverables: {deal.deliverables}
+    Timeline: {deal.timeline}
+
+    Terms and Conditions:
+    1. Content creation and posting requirements
+    2. Usage rights and licensing
+    3. Payment terms and conditions
+    4. Performance metrics and reporting
+    5. Cancellation and modification clauses
+
+    """
+
+
+class RenderQueueFull(Exception):
+    """Raised when too many contract renders are already waiting"""
+
+
+class ContractTemplate:
+    """A template parsed once into literal text and {scope.field} slots"""
+
+    def __init__(self, source: str):
+        self.version = hashlib.sha256(source.encode()).hexdigest()[:16]
+        self.parts: List[Tuple[str, Optional[Tuple[str, str]]]] = []
+        for literal, field, _, _ in string.Formatter().parse(source):
+            slot = tuple(field.split(".", 1)) if field else None
+            self.parts.append((literal, slot))
+        self.fields = sorted({slot for _, slot in self.parts if slot})
+
+    def render(self, **scopes: dict) -> str:
+        return "".join(
+            literal + (str(scopes[slot[0]][slot[1]]) if slot else "")
+            for literal, slot in self.parts
+        )
+
+    def key(self, **scopes: dict) -> str:
+        """Hash of the template and only the fields it uses; equal keys render identical PDFs"""
+        values = {f"{scope}.{name}": scopes[scope].get(name) for scope, name in self.fields}
+        canonical = json.dumps({"template": self.version, "values": values}, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@lru_cache(maxsize=4096)
+def _wrap(line: str, max_width: float) -> Tuple[str, ...]:
+    # Boilerplate lines repeat across contracts, so each worker measures them once
+    from reportlab.lib.utils import simpleSplit
+    return tuple(simpleSplit(line, FONT_NAME, FONT_SIZE, max_width)) or ("",)
+
+
+def render_contract_pdf(content: str, path: str) -> str:
+    """Lay out contract text with wrapping and page breaks; runs in a worker process"""
+    from reportlab.pdfgen import canvas
+
+    # Unique per render, so two renders of one contract never rename each other's partial file
+    fd, part_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f"{os.path.basename(path)}.", suffix=".part")
+    os.close(fd)
+    try:
+        _draw_contract(canvas.Canvas(part_path), content)
+        # mkstemp creates the file owner-only; contracts are served like any other static file
+        os.chmod(part_path, 0o644)
+        os.replace(part_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(part_path)
+        raise
+    return path
+
+
+def _draw_contract(c, content: str):
+    width, height = c._pagesize
+    max_width = width - 2 * MARGIN
+
+    def new_page_text():
+        text = c.beginText(MARGIN, height - MARGIN)
+        text.setFont(FONT_NAME, FONT_SIZE)
+        text.setLeading(LEADING)
+        return text
+
+    text = new_page_text()
+    for line in content.strip().split("\n"):
+        # A blank line still takes up a line
+        for wrapped in _wrap(line.strip(), max_width):
+            if text.getY() < MARGIN:
+                c.drawText(text)
+                c.showPage()
+                text = new_page_text()
+            text.textLine(wrapped)
+
+    c.drawText(text)
+    c.save()
+
+
+class ContractRenderer:
+    """Renders contract PDFs in a process pool and skips renders whose inputs are unchanged"""
+
+    def __init__(self, directory: str = "static/contracts", workers: int = 2, queue_size: int = 32):
+        self.directory = directory
+        self.workers = workers
+        self.queue_size = queue_size
+        self.manifest_path = os.path.join(directory, "manifest.json")
+        self.hits = 0
+        self.misses = 0
+        self.pool_restarts = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        # Template key each file was rendered from, so repeat generations are free
+        self._keys: Dict[str, str] = {}
+        self._renders = Coalescer()
+        self._manifest_lock = asyncio.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.manifest_path):
+            return
+        try:
+            with open(self.manifest_path) as f:
+                keys = json.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable contract manifest: {str(e)}")
+            return
+        self._keys = {name: key for name, key in keys.items() if os.path.exists(self.path_for(name))}
+
+    def _write_manifest(self, keys: Dict[str, str]):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(keys, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def start(self):
+        if self._pool is None:
+            os.makedirs(self.directory, exist_ok=True)
+            # Forking a process that runs an event loop and helper threads is unsafe
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            # Start a worker now rather than on the first request
+            self._pool.submit(os.getpid)
+
+    async def close(self):
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, True)
+
+    def _replace_broken_pool(self, broken: ProcessPoolExecutor):
+        # Every render that was on the broken pool lands here; only the first replaces it
+        if self._pool is not broken:
+            return
+        print("Contract render pool broke (a worker died); starting a new one")
+        self.pool_restarts += 1
+        self._pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        self.start()
+
+    async def _render_in_pool(self, content: str, path: str):
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            return await loop.run_in_executor(pool, render_contract_pdf, content, path)
+        except BrokenProcessPool:
+            # One crashed or OOM-killed worker breaks the whole pool, so replace it and retry once
+            self._replace_broken_pool(pool)
+            return await loop.run_in_executor(self._pool, render_contract_pdf, content, path)
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.pdf")
+
+    def etag(self, name: str) -> Optional[str]:
+        """Quoted ETag for a rendered file, if it was rendered from a known key"""
+        key = self._keys.get(name)
+        return f'"{key}"' if key and os.path.exists(self.path_for(name)) else None
+
+    async def render(self, content: str, name: str, key: str) -> str:
+        """Render content to <directory>/<name>.pdf unless it was already rendered from key"""
+        path = self.path_for(name)
+        if self._keys.get(name) == key and os.path.exists(path):
+            self.hits += 1
+            return path
+
+        if (name, key) in self._renders:
+            self.hits += 1
+        else:
+            if self._pending >= self.workers + self.queue_size:
+                raise RenderQueueFull(f"{self._pending} contract renders already pending")
+            self.misses += 1
+            self._pending += 1
+        # Runs in a task the renderer owns, so a cancelled caller never fails the others waiting on it
+        result, _ = await self._renders.run((name, key), lambda: self._render(content, name, key, path))
+        return result
+
+    async def _render(self, content: str, name: str, key: str, path: str) -> str:
+        try:
+            self.start()
+            await self._render_in_pool(content, path)
+        finally:
+            self._pending -= 1
+        self._keys[name] = key
+        async with self._manifest_lock:
+            await asyncio.to_thread(self._write_manifest, dict(self._keys))
+        return path
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._keys),
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "pool_restarts": self.pool_restarts
+        }
@@ -0,0 +1,163 @@
+import asyncio
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# (line number the record starts on, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[dict], Optional[str]]
+
+
+async def iter_lines(read: Callable[[int], Awaitable[bytes]], chunk_size: int = 65536) -> AsyncIterator[str]:
+    """Decode an upload chunk by chunk and yield its lines without holding the whole file"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    while True:
+        chunk = await read(chunk_size)
+        pending += decoder.decode(chunk, final=not chunk)
+        lines = pending.split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip("\r")
+        if not chunk:
+            break
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_records(read: Callable[[int], Awaitable[bytes]]) -> AsyncIterator[Record]:
+    """Rows of a CSV upload with a header line, keyed by column name"""
+    header: Optional[List[str]] = None
+    record, start = "", 0
+    line_number = 0
+    async for line in iter_lines(read):
+        line_number += 1
+        record = f"{record}\n{line}" if record else line
+        start = start or line_number
+        # A quoted field may span lines; the record ends once its quotes balance
+        if record.count('"') % 2:
+            continue
+        text, row_number = record, start
+        record, start = "", 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield row_number, None, f"Expected {len(header)} columns, found {len(values)}"
+            continue
+        yield row_number, dict(zip(header, values)), None
+    if record:
+        yield start, None, "Unterminated quoted field"
+
+
+async def iter_ndjson_records(read: Callable[[int], Awaitable[bytes]]) -> AsyncIterator[Record]:
+    """One JSON object per line"""
+    line_number = 0
+    async for line in iter_lines(read):
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        # Numbers are accepted where the model expects text, as they would be from CSV
+        yield line_number, {
+            k: str(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else v
+            for k, v in record.items()
+        }, None
+
+
+class ImportReport:
+    """Counts and per-row errors for one import, with the error list capped"""
+
+    def __init__(self, max_errors: int = 1000):
+        self.max_errors = max_errors
+        self.total_rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def fail(self, row: int, error: str, record_id: Optional[str] = None):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": row, "id": record_id, "error": error})
+
+    def to_dict(self) -> dict:
+        return {
+            "total_rows": self.total_rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda e: e["line"]),
+            "errors_truncated": self.failed > len(self.errors)
+        }
+
+
+async def import_records(
+    records: AsyncIterator[Record],
+    validate: Callable[[dict], dict],
+    write_batch: Callable[[List[Tuple[int, dict]]], Awaitable[List[Tuple[int, str]]]],
+    batch_size: int = 500,
+    concurrency: int = 4,
+    max_errors: int = 1000
+) -> dict:
+    """Validate records and write them in batches, keeping a few batches in flight
+
+    validate returns the row to store or raises ValueError; write_batch returns
+    (line number, error) for each row it could not store.
+    """
+    report = ImportReport(max_errors)
+    in_flight = set()
+    batch: Dict[str, Tuple[int, dict]] = {}
+
+    async def write(rows: List[Tuple[int, dict]]):
+        failures = await write_batch(rows)
+        failed_rows = {row for row, _ in failures}
+        by_row = {row: data for row, data in rows}
+        for row, error in failures:
+            report.fail(row, error, by_row[row].get("id"))
+        report.imported += len(rows) - len(failed_rows)
+
+    async def flush():
+        rows = list(batch.values())
+        batch.clear()
+        if len(in_flight) >= concurrency:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            in_flight.difference_update(done)
+            for task in done:
+                task.result()
+        in_flight.add(asyncio.create_task(write(rows)))
+
+    try:
+        async for row, record, error in records:
+            report.total_rows += 1
+            if error:
+                report.fail(row, error)
+                continue
+            try:
+                data = validate(record)
+            except ValueError as e:
+                report.fail(row, str(e), record.get("id"))
+                continue
+            previous = batch.get(data["id"])
+            if previous is not None:
+                # An upsert cannot touch the same id twice; the later row wins
+                report.fail(previous[0], "Superseded by a later row with the same id", data["id"])
+            batch[data["id"]] = (row, data)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+        await asyncio.gather(*in_flight)
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+    return report.to_dict()
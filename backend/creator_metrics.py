@@ -0,0 +1,71 @@
+import re
+from typing import Optional
+
+# Suffixes seen in follower counts, including the Indian lakh/crore
+MULTIPLIERS = {
+    "": 1,
+    "k": 1_000, "thousand": 1_000,
+    "m": 1_000_000, "mn": 1_000_000, "million": 1_000_000,
+    "b": 1_000_000_000, "bn": 1_000_000_000, "billion": 1_000_000_000,
+    "l": 100_000, "lac": 100_000, "lakh": 100_000, "lakhs": 100_000,
+    "cr": 10_000_000, "crore": 10_000_000, "crores": 10_000_000
+}
+
+# Lower bound of each tier by follower count, largest first
+TIERS = [
+    ("mega", 1_000_000),
+    ("macro", 500_000),
+    ("mid", 100_000),
+    ("micro", 10_000),
+    ("nano", 0)
+]
+
+METRIC_FIELDS = ("followers_count", "engagement_rate", "engaged_followers", "tier")
+
+_COUNT = re.compile(r"^\s*([0-9][0-9,]*(?:\.[0-9]+)?)\s*([a-z]*)\s*\+?\s*(?:followers|subscribers|subs)?\s*$")
+_PERCENT = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*%?\s*$")
+
+
+def parse_count(value) -> Optional[int]:
+    """'1.2M' -> 1200000, '12,345' -> 12345, '3.5 lakh' -> 350000; None if unreadable"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    match = _COUNT.match(str(value or "").lower())
+    if not match or match.group(2) not in MULTIPLIERS:
+        return None
+    return int(round(float(match.group(1).replace(",", "")) * MULTIPLIERS[match.group(2)]))
+
+
+def parse_percent(value) -> Optional[float]:
+    """'4.5%' -> 4.5; None if unreadable"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _PERCENT.match(str(value or ""))
+    return float(match.group(1)) if match else None
+
+
+def tier_for(followers: Optional[int]) -> Optional[str]:
+    if followers is None:
+        return None
+    return next(name for name, floor in TIERS if followers >= floor)
+
+
+def creator_metrics(followers, engagement) -> dict:
+    """Numeric and derived columns for a creator's free-form followers and engagement"""
+    followers_count = parse_count(followers)
+    engagement_rate = parse_percent(engagement)
+    return {
+        "followers_count": followers_count,
+        "engagement_rate": engagement_rate,
+        # The audience that interacts with a typical post
+        "engaged_followers": (
+            int(followers_count * engagement_rate / 100)
+            if followers_count is not None and engagement_rate is not None else None
+        ),
+        "tier": tier_for(followers_count)
+    }
+
+
+def normalize_creator(creator: dict) -> dict:
+    """Return the creator with its numeric metric columns recomputed from the text fields"""
+    return {**creator, **creator_metrics(creator.get("followers"), creator.get("engagement"))}
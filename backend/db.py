@@ -0,0 +1,83 @@
+import asyncio
+from typing import Optional
+
+import httpx
+from supabase import AsyncClientOptions, acreate_client
+
+from metrics import track_dependency
+
+
+class DatabaseTimeout(Exception):
+    """Raised when a Supabase call does not finish within its timeout"""
+
+
+def _operation(query) -> str:
+    """Label a query builder as e.g. "GET creators"; best effort across postgrest versions"""
+    request = getattr(query, "request", None)
+    table = str(getattr(request, "path", "")).rstrip("/").rsplit("/", 1)[-1] or "query"
+    method = getattr(getattr(request, "http_method", None), "value", None)
+    return f"{method} {table}" if method else table
+
+
+class Database:
+    """Shared async Supabase client with pooled connections and per-call timeouts"""
+
+    def __init__(self, url: str, key: str, timeout: float = 10.0, max_connections: int = 20):
+        self.url = url
+        self.key = key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._http: Optional[httpx.AsyncClient] = None
+        # Caps queued PostgREST round-trips so a burst cannot exhaust the pool
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def connect(self):
+        """Create the async Supabase client backed by one pooled HTTP client"""
+        if self._client is not None:
+            return self._client
+
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections
+            )
+        )
+        options = AsyncClientOptions(
+            httpx_client=self._http,
+            postgrest_client_timeout=self.timeout
+        )
+        self._client = await acreate_client(self.url, self.key, options=options)
+        return self._client
+
+    def use(self, client):
+        """Swap in an already constructed client (local stand-ins, benchmarks)"""
+        self._client = client
+
+    async def close(self):
+        """Release pooled connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            raise RuntimeError("Database is not connected")
+        return self._client
+
+    def table(self, name: str):
+        """Start a query builder on a table; run it with execute()"""
+        return self.client.table(name)
+
+    async def execute(self, query, timeout: Optional[float] = None):
+        """Execute a query builder without blocking the event loop"""
+        timeout = timeout or self.timeout
+        async with self._slots:
+            with track_dependency("supabase", _operation(query)):
+                try:
+                    return await asyncio.wait_for(query.execute(), timeout)
+                except asyncio.TimeoutError:
+                    raise DatabaseTimeout(f"Supabase call timed out after {timeout}s")
@@ -0,0 +1,188 @@
+import asyncio
+import cProfile
+import pstats
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from metrics import REGISTRY, Counter, Histogram
+
+LOOP_LAG = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "How late the event loop woke a sleeping task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+))
+LOOP_STALLS = REGISTRY.register(Counter(
+    "event_loop_stalls_total", "Times the event loop was blocked longer than the slow threshold"
+))
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class Diagnostics:
+    """Event-loop lag sampling, a blocked-loop watchdog and sampled per-route CPU profiles
+
+    cProfile follows the loop thread, not a task, so a profile holds everything the loop
+    ran while the sampled request was in flight, other requests included. Each route
+    reports how many requests overlapped its profiles so mixed samples can be told apart.
+    """
+
+    def __init__(
+        self,
+        slow_threshold: float = 0.1,
+        lag_interval: float = 0.05,
+        profile_rate: float = 0.0,
+        max_events: int = 100,
+        max_samples: int = 2000,
+        stack_depth: int = 20
+    ):
+        self.slow_threshold = slow_threshold
+        self.lag_interval = lag_interval
+        self.profile_rate = profile_rate
+        self.stack_depth = stack_depth
+        self.lag_samples = deque(maxlen=max_samples)
+        self.stalls = deque(maxlen=max_events)
+        self.profiles: Dict[str, dict] = {}
+        self._heartbeat = time.perf_counter()
+        self._loop_thread_id: Optional[int] = None
+        self._sampler: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._stall: Optional[dict] = None
+        # cProfile sees the whole thread, so only one request is profiled at a time
+        self._profiling = False
+        self._in_flight = 0
+        self._overlapping = 0
+
+    def start(self):
+        if self._sampler is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._stopped.clear()
+        self._sampler = asyncio.create_task(self._sample_lag())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        if self._sampler is None:
+            return
+        self._stopped.set()
+        self._sampler.cancel()
+        await asyncio.gather(self._sampler, return_exceptions=True)
+        self._sampler = None
+        await asyncio.to_thread(self._watchdog.join)
+        self._watchdog = None
+
+    async def _sample_lag(self):
+        while True:
+            self._heartbeat = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, time.perf_counter() - self._heartbeat - self.lag_interval)
+            self.lag_samples.append(lag)
+            LOOP_LAG.observe(lag)
+
+    def _watch(self):
+        # Runs in its own thread so it can see the loop while the loop itself is stuck
+        while not self._stopped.wait(self.slow_threshold / 4):
+            blocked = time.perf_counter() - self._heartbeat - self.lag_interval
+            if blocked < self.slow_threshold:
+                self._stall = None
+                continue
+            if self._stall is None:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = traceback.format_stack(frame)[-self.stack_depth:] if frame is not None else []
+                self._stall = {"detected_at": time.time(), "blocked_ms": 0.0, "stack": [line.rstrip() for line in stack]}
+                self.stalls.append(self._stall)
+                LOOP_STALLS.inc()
+                location = stack[-1].strip().splitlines()[0] if stack else "unknown"
+                print(f"Event loop blocked for over {self.slow_threshold * 1000:.0f}ms at {location}")
+            self._stall["blocked_ms"] = round(blocked * 1000, 1)
+
+    @contextmanager
+    def profile(self, route: str):
+        """Profile the loop while this request runs, if it is sampled and no other profile is running"""
+        self._in_flight += 1
+        try:
+            if self._profiling:
+                self._overlapping += 1
+            if self._profiling or random.random() >= self.profile_rate:
+                yield
+                return
+            self._profiling = True
+            # Requests already running and any that start before this one ends
+            self._overlapping = self._in_flight - 1
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+                self._profiling = False
+                self._record(route, profiler)
+        finally:
+            self._in_flight -= 1
+
+    def _record(self, route: str, profiler: cProfile.Profile):
+        entry = self.profiles.setdefault(
+            route, {"requests": 0, "isolated_requests": 0, "overlapping_requests": 0, "stats": None}
+        )
+        entry["requests"] += 1
+        entry["overlapping_requests"] += self._overlapping
+        if not self._overlapping:
+            entry["isolated_requests"] += 1
+        if entry["stats"] is None:
+            entry["stats"] = pstats.Stats(profiler)
+        else:
+            entry["stats"].add(profiler)
+
+    @staticmethod
+    def _top_functions(stats: pstats.Stats, limit: int) -> list:
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                "function": f"{name} ({filename}:{line})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 2),
+                "cumulative_ms": round(cumulative * 1000, 2)
+            })
+        rows.sort(key=lambda row: row["own_ms"], reverse=True)
+        return rows[:limit]
+
+    def report(self, limit: int = 20) -> dict:
+        lag = list(self.lag_samples)
+        return {
+            "loop_lag_ms": {
+                "samples": len(lag),
+                "p50": round(_percentile(lag, 50) * 1000, 2),
+                "p99": round(_percentile(lag, 99) * 1000, 2),
+                "max": round(max(lag, default=0.0) * 1000, 2)
+            },
+            "slow_threshold_ms": self.slow_threshold * 1000,
+            "stalls": [dict(stall) for stall in reversed(self.stalls)],
+            "profile_rate": self.profile_rate,
+            "profiles": {
+                route: {
+                    "requests": entry["requests"],
+                    # Profiled requests that had the loop to themselves, and how many others ran alongside the rest
+                    "isolated_requests": entry["isolated_requests"],
+                    "overlapping_requests": entry["overlapping_requests"],
+                    "top": self._top_functions(entry["stats"], limit)
+                }
+                for route, entry in self.profiles.items()
+            }
+        }
+
+    def reset(self):
+        self.lag_samples.clear()
+        self.stalls.clear()
+        self.profiles = {}
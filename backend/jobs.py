@@ -0,0 +1,245 @@
+import asyncio
+import json
+import sqlite3
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class MemoryJobStore:
+    """Keeps the most recent job records in process memory"""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, dict]" = OrderedDict()
+
+    async def save(self, job: dict):
+        self._jobs[job["id"]] = json.loads(json.dumps(job, default=str))
+        self._jobs.move_to_end(job["id"])
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return self._jobs.get(job_id)
+
+
+class SQLiteJobStore:
+    """Keeps job records in a local SQLite file so they survive restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            # Anything left unfinished belonged to a process that is gone
+            for job_id, data in conn.execute("SELECT id, data FROM jobs").fetchall():
+                job = json.loads(data)
+                if job["status"] not in FINISHED:
+                    job["status"] = FAILED
+                    job["error"] = "Interrupted by server restart"
+                    conn.execute("UPDATE jobs SET data = ? WHERE id = ?", (json.dumps(job), job_id))
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def _save(self, job: dict):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data) VALUES (?, ?)",
+                (job["id"], json.dumps(job, default=str))
+            )
+
+    def _get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def save(self, job: dict):
+        await asyncio.to_thread(self._save, job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._get, job_id)
+
+
+class JobContext:
+    """Handle passed to a running job for reporting progress and partial results"""
+
+    def __init__(self, manager: "JobManager", job: dict):
+        self._manager = manager
+        self._job = job
+
+    async def set_total(self, total: int):
+        self._job["progress"]["total"] = total
+        await self._manager._save(self._job)
+
+    async def add_result(self, result):
+        self._job["results"].append(result)
+        self._job["progress"]["completed"] += 1
+        await self._manager._save(self._job)
+
+
+class JobManager:
+    """In-process job queue served by a fixed pool of async workers"""
+
+    def __init__(self, store=None, workers: int = 4, queue_size: int = 100):
+        self.store = store or MemoryJobStore()
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers = []
+        self._functions: Dict[str, Callable[[JobContext], Awaitable]] = {}
+        self._jobs: Dict[str, dict] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._cleanups: Dict[str, Callable[[], Awaitable]] = {}
+        self._cancelled = set()
+
+    def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        # Jobs still queued or interrupted mid-run never reach _finish
+        for job_id in list(self._cleanups):
+            await self._cleanup(job_id)
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def running(self) -> int:
+        return len(self._tasks)
+
+    async def _save(self, job: dict):
+        job["updated_at"] = datetime.now().isoformat()
+        await self.store.save(job)
+
+    async def submit(
+        self,
+        kind: str,
+        fn: Callable[[JobContext], Awaitable],
+        cleanup: Optional[Callable[[], Awaitable]] = None
+    ) -> dict:
+        """Queue fn(ctx) to run in the background and return its job record
+
+        cleanup() is awaited once the job is over, however it ends, including
+        when it is cancelled before a worker picks it up.
+        """
+        self.start()
+        now = datetime.now().isoformat()
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "status": QUEUED,
+            "progress": {"completed": 0, "total": None},
+            "results": [],
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        if self._queue.full():
+            raise JobQueueFull("Job queue is full, try again later")
+
+        self._jobs[job["id"]] = job
+        self._functions[job["id"]] = fn
+        if cleanup is not None:
+            self._cleanups[job["id"]] = cleanup
+        self._queue.put_nowait(job["id"])
+        snapshot = dict(job)
+        await self._save(job)
+        return snapshot
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        if job_id in self._jobs:
+            return self._jobs[job_id]
+        return await self.store.get(job_id)
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued or running job"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return await self.store.get(job_id)
+        if job["status"] in FINISHED:
+            return job
+
+        task = self._tasks.get(job_id)
+        if task is not None:
+            self._cancelled.add(job_id)
+            task.cancel()
+        else:
+            await self._finish(job, CANCELLED)
+        return job
+
+    async def _finish(self, job: dict, status: str, result=None, error: Optional[str] = None):
+        job["status"] = status
+        job["result"] = result
+        job["error"] = error
+        await self._save(job)
+        self._functions.pop(job["id"], None)
+        self._tasks.pop(job["id"], None)
+        # Finished jobs are served from the store from here on
+        self._jobs.pop(job["id"], None)
+        await self._cleanup(job["id"])
+
+    async def _cleanup(self, job_id: str):
+        cleanup = self._cleanups.pop(job_id, None)
+        if cleanup is None:
+            return
+        try:
+            await cleanup()
+        except Exception as e:
+            print(f"Cleanup for job {job_id} failed: {str(e)}")
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is None or job["status"] != QUEUED:
+                    continue
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: dict):
+        fn = self._functions[job["id"]]
+        job["status"] = RUNNING
+        await self._save(job)
+
+        task = asyncio.create_task(fn(JobContext(self, job)))
+        self._tasks[job["id"]] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job["id"] not in self._cancelled:
+                # The worker itself is being stopped
+                task.cancel()
+                raise
+            self._cancelled.discard(job["id"])
+            await self._finish(job, CANCELLED)
+        except Exception as e:
+            print(f"Job {job['id']} ({job['kind']}) failed: {str(e)}")
+            detail = getattr(e, "detail", None) or str(e)
+            await self._finish(job, FAILED, error=detail)
+        else:
+            await self._finish(job, SUCCEEDED, result=result)
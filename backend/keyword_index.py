@@ -0,0 +1,90 @@
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+INDEXED_FIELDS = ("name", "description", "category", "platform", "location")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "was", "we", "will", "with",
+    "you", "your"
+}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in re.findall(r"[a-z0-9]+", (text or "").lower()) if t not in STOPWORDS]
+
+
+class CreatorKeywordIndex:
+    """In-memory inverted index over creator text fields, ranked with BM25"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ready = False
+        self.documents: Dict[str, dict] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def build(self, creators: List[dict]):
+        self.documents = {}
+        self._postings = {}
+        self._terms = {}
+        self._lengths = {}
+        self._total_length = 0
+        for creator in creators:
+            self.add(creator)
+        self.ready = True
+
+    def add(self, creator: dict):
+        """Index a creator, replacing any previous version of it"""
+        creator_id = creator["id"]
+        self.remove(creator_id)
+        terms = Counter(tokenize(" ".join(str(creator.get(f) or "") for f in INDEXED_FIELDS)))
+        self.documents[creator_id] = creator
+        self._terms[creator_id] = terms
+        self._lengths[creator_id] = sum(terms.values())
+        self._total_length += self._lengths[creator_id]
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[creator_id] = frequency
+
+    def remove(self, creator_id: str):
+        terms = self._terms.pop(creator_id, None)
+        if terms is None:
+            return
+        self.documents.pop(creator_id, None)
+        self._total_length -= self._lengths.pop(creator_id)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(creator_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, weighted_terms: Dict[str, float], limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Rank creators for {term: weight}; only postings of the query terms are visited"""
+        count = len(self.documents)
+        if not count:
+            return []
+        average_length = self._total_length / count or 1.0
+
+        scores: Dict[str, float] = {}
+        for term, weight in weighted_terms.items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for creator_id, frequency in postings.items():
+                norm = frequency + self.k1 * (1 - self.b + self.b * self._lengths[creator_id] / average_length)
+                scores[creator_id] = scores.get(creator_id, 0.0) + weight * idf * frequency * (self.k1 + 1) / norm
+
+        if limit is None:
+            return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
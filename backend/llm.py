@@ -0,0 +1,138 @@
+import asyncio
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+from typing import AsyncIterator, List, Optional
+
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError
+from openai.types.chat import ChatCompletion
+
+from cache import TieredCache
+from metrics import record_usage, track_dependency
+
+
+class LLMGateway:
+    """Shared async OpenAI client with a concurrency cap, timeouts and jittered retries"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        max_concurrency: int = 8,
+        max_streams: int = 8,
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        memo: Optional[TieredCache] = None
+    ):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                # An open stream keeps its connection until the consumer is done
+                max_connections=max_concurrency + max_streams,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+        # Retries are handled here so that backoff is jittered and counted against the cap
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self._http, max_retries=0, timeout=timeout)
+        self._slots = asyncio.Semaphore(max_concurrency)
+        # Streams are paced by their readers, so they get their own cap instead of holding a slot
+        self._streams = asyncio.Semaphore(max_streams)
+        # Completions for call sites that opt in with memoize=True
+        self.memo = memo
+
+    async def close(self):
+        await self.client.close()
+
+    def _should_retry(self, error: Exception) -> bool:
+        if isinstance(error, (APIConnectionError, APITimeoutError)):
+            return True
+        if isinstance(error, APIStatusError):
+            return error.status_code == 429 or error.status_code >= 500
+        return False
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: sleep a random amount up to the exponential ceiling
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def _call(self, operation: str, create, **kwargs):
+        # Callers hold a slot, so backing off under 429s also sheds load
+        attempt = 0
+        while True:
+            try:
+                with track_dependency("openai", operation):
+                    return await create(**kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not self._should_retry(e):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                attempt += 1
+
+    @staticmethod
+    def memo_key(**kwargs) -> str:
+        """Key a completion by model, messages and sampling parameters"""
+        canonical = json.dumps(kwargs, sort_keys=True, default=str)
+        return "chat:" + hashlib.sha256(canonical.encode()).hexdigest()
+
+    async def chat(self, memoize: bool = False, **kwargs):
+        """Create a chat completion, retrying on 429/5xx and connection failures"""
+        if not memoize or self.memo is None:
+            async with self._slots:
+                response = await self._call("chat", self.client.chat.completions.create, **kwargs)
+            record_usage(response.model, response.usage)
+            return response
+
+        key = self.memo_key(**kwargs)
+        cached = await self.memo.get(key)
+        if cached is not None:
+            return ChatCompletion.model_validate(cached)
+
+        started = time.perf_counter()
+        async with self._slots:
+            response = await self._call("chat", self.client.chat.completions.create, **kwargs)
+        record_usage(response.model, response.usage)
+        await self.memo.set(key, response.model_dump(mode="json"), cost=time.perf_counter() - started)
+        return response
+
+    async def forget(self, **kwargs):
+        """Drop a memoized completion, e.g. one whose content turned out to be unusable"""
+        if self.memo is not None:
+            await self.memo.delete(self.memo_key(**kwargs))
+
+    async def stream_chat(self, **kwargs) -> AsyncIterator[str]:
+        """Yield chat completion content as it is generated; only opening the stream is retried"""
+        async with self._streams:
+            stream = await self._call(
+                "chat_stream",
+                self.client.chat.completions.create,
+                stream=True,
+                stream_options={"include_usage": True},
+                **kwargs
+            )
+            async for chunk in stream:
+                if chunk.usage is not None:
+                    # Sent as a final chunk without choices
+                    record_usage(chunk.model, chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def transcribe(self, path: str, model: str = "whisper-1") -> str:
+        """Transcribe an audio file; the file is streamed from disk, not loaded by the caller"""
+        async with self._slots:
+            response = await self._call("transcription", self.client.audio.transcriptions.create, model=model, file=Path(path))
+        return response.text
+
+    async def embed(self, texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
+        """Embed a batch of texts"""
+        async with self._slots:
+            response = await self._call("embeddings", self.client.embeddings.create, model=model, input=texts)
+        record_usage(model, response.usage)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
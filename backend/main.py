@@ -1,18 +1,41 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import asyncio
-from typing import List, Optional
+from typing import List, Literal, Optional
 import uuid
+import hashlib
+import time
 from datetime import datetime
-from supabase import create_client
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
-import requests
 import json
+import shutil
+import tempfile
+import weakref
+from contextlib import nullcontext, suppress
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Match
+from db import Database
+from llm import LLMGateway
+from cache import EntityCache, TieredCache
+from keyword_index import CreatorKeywordIndex
+from prefilter import PREFILTER_COLUMNS, campaign_terms, platform_predicate, rank_candidates
+from pagination import check_sort, encode_cursor, iter_rows, list_response, parse_fields
+from jobs import JobManager, JobQueueFull, MemoryJobStore, SQLiteJobStore
+from scoring import score_creators
+from tts import TTSClient
+from audio_store import AudioStore
+from creator_metrics import TIERS, normalize_creator
+from negotiation_summary import fold_summary
+from broker import create_broker
+from transcription import FakeTranscriptionBackend, TranscriptionPipeline, TranscriptionQueueFull, UploadTooLarge, WhisperBackend, spool_upload
+from creator_import import import_records, iter_csv_records, iter_ndjson_records
+from contracts import CONTRACT_TEMPLATE, ContractRenderer, ContractTemplate, RenderQueueFull
+from diagnostics import Diagnostics
+from metrics import REGISTRY, HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS, Counter, Gauge, current_route
+from vector_index import CreatorVectorIndex, HashingEmbedder, OpenAIEmbedder
 load_dotenv()
 
 
@@ -22,6 +45,57 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 ELEVENLABS_AGENT_ID = os.getenv("ELEVENLABS_AGENT_ID")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
+DB_TIMEOUT = float(os.getenv("DB_TIMEOUT", "10"))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "20"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_STREAMS = int(os.getenv("LLM_MAX_STREAMS", "16"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+BATCH_OUTREACH_CONCURRENCY = int(os.getenv("BATCH_OUTREACH_CONCURRENCY", "16"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_SIZE = int(os.getenv("JOB_QUEUE_SIZE", "100"))
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+VECTOR_INDEX_PATH = os.getenv("VECTOR_INDEX_PATH", "data/creator_index.npz")
+VECTOR_INDEX_ANN = os.getenv("VECTOR_INDEX_ANN", "false").lower() == "true"
+SEARCH_CANDIDATES = int(os.getenv("SEARCH_CANDIDATES", "25"))
+SEARCH_RETRIEVAL_POOL = int(os.getenv("SEARCH_RETRIEVAL_POOL", "100"))
+SCORING_CHUNK_SIZE = int(os.getenv("SCORING_CHUNK_SIZE", "10"))
+SCORING_CHUNK_RETRIES = int(os.getenv("SCORING_CHUNK_RETRIES", "1"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "600"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "512"))
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH")
+LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "500"))
+CAMPAIGN_CACHE_TTL = float(os.getenv("CAMPAIGN_CACHE_TTL", "300"))
+CREATOR_CACHE_TTL = float(os.getenv("CREATOR_CACHE_TTL", "300"))
+DEAL_CACHE_TTL = float(os.getenv("DEAL_CACHE_TTL", "60"))
+ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", "2048"))
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "30"))
+TTS_MAX_IN_FLIGHT = int(os.getenv("TTS_MAX_IN_FLIGHT", "4"))
+AUDIO_CACHE_MAX_MB = int(os.getenv("AUDIO_CACHE_MAX_MB", "500"))
+LLM_MEMO_TTL = float(os.getenv("LLM_MEMO_TTL", "86400"))
+LLM_MEMO_SIZE = int(os.getenv("LLM_MEMO_SIZE", "1024"))
+LLM_MEMO_PATH = os.getenv("LLM_MEMO_PATH")
+NEGOTIATION_SUMMARY_CHUNK = int(os.getenv("NEGOTIATION_SUMMARY_CHUNK", "20"))
+NEGOTIATION_SUMMARY_MAX_TOKENS = int(os.getenv("NEGOTIATION_SUMMARY_MAX_TOKENS", "500"))
+# redis://... fans negotiation updates out across workers; unset keeps them in-process
+BROKER_URL = os.getenv("BROKER_URL")
+NEGOTIATION_WS_QUEUE = int(os.getenv("NEGOTIATION_WS_QUEUE", "100"))
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "whisper")
+TRANSCRIPTION_WORKERS = int(os.getenv("TRANSCRIPTION_WORKERS", "4"))
+TRANSCRIPTION_QUEUE = int(os.getenv("TRANSCRIPTION_QUEUE", "64"))
+TRANSCRIPTION_SEGMENT_SECONDS = int(os.getenv("TRANSCRIPTION_SEGMENT_SECONDS", "300"))
+TRANSCRIPTION_MAX_MB = int(os.getenv("TRANSCRIPTION_MAX_MB", "200"))
+TRANSCRIPTION_SPOOL_DIR = os.getenv("TRANSCRIPTION_SPOOL_DIR")
+CREATOR_IMPORT_BATCH_SIZE = int(os.getenv("CREATOR_IMPORT_BATCH_SIZE", "500"))
+CREATOR_IMPORT_CONCURRENCY = int(os.getenv("CREATOR_IMPORT_CONCURRENCY", "4"))
+CONTRACT_RENDER_WORKERS = int(os.getenv("CONTRACT_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+CONTRACT_RENDER_QUEUE = int(os.getenv("CONTRACT_RENDER_QUEUE", "32"))
+# Loop lag sampling, blocked-loop stack capture and sampled profiles at /api/debug/diagnostics
+DIAGNOSTICS = os.getenv("DIAGNOSTICS", "false").lower() == "true"
+DIAGNOSTICS_SLOW_MS = float(os.getenv("DIAGNOSTICS_SLOW_MS", "100"))
+DIAGNOSTICS_PROFILE_RATE = float(os.getenv("DIAGNOSTICS_PROFILE_RATE", "0"))
 
 app = FastAPI(title="CreatorFlow AI Backend", version="1.0.0")
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -35,8 +109,49 @@ origins = [
 ]
 
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-client = OpenAI(api_key= OPENAI_API_KEY)
+db = Database(SUPABASE_URL, SUPABASE_KEY, timeout=DB_TIMEOUT, max_connections=DB_MAX_CONNECTIONS)
+llm = LLMGateway(
+    OPENAI_API_KEY,
+    max_concurrency=LLM_MAX_CONCURRENCY,
+    max_streams=LLM_MAX_STREAMS,
+    timeout=LLM_TIMEOUT,
+    max_retries=LLM_MAX_RETRIES,
+    memo=TieredCache(LLM_MEMO_SIZE, LLM_MEMO_TTL, LLM_MEMO_PATH) if LLM_MEMO_TTL > 0 else None
+)
+tts = TTSClient(ELEVENLABS_API_KEY, max_in_flight=TTS_MAX_IN_FLIGHT, timeout=TTS_TIMEOUT)
+audio_store = AudioStore("static/audio", max_bytes=AUDIO_CACHE_MAX_MB * 1024 * 1024)
+contract_template = ContractTemplate(CONTRACT_TEMPLATE)
+broker = create_broker(BROKER_URL, max_queue=NEGOTIATION_WS_QUEUE)
+transcriber = TranscriptionPipeline(
+    FakeTranscriptionBackend() if TRANSCRIPTION_BACKEND == "fake" else WhisperBackend(llm),
+    workers=TRANSCRIPTION_WORKERS,
+    queue_size=TRANSCRIPTION_QUEUE,
+    segment_seconds=TRANSCRIPTION_SEGMENT_SECONDS
+)
+contract_renderer = ContractRenderer("static/contracts", workers=CONTRACT_RENDER_WORKERS, queue_size=CONTRACT_RENDER_QUEUE)
+jobs = JobManager(
+    SQLiteJobStore(JOB_STORE_PATH) if JOB_STORE_PATH else MemoryJobStore(),
+    workers=JOB_WORKERS,
+    queue_size=JOB_QUEUE_SIZE
+)
+creator_index = CreatorVectorIndex(
+    HashingEmbedder() if EMBEDDING_BACKEND == "hashing" else OpenAIEmbedder(llm, model=EMBEDDING_MODEL),
+    path=VECTOR_INDEX_PATH,
+    ann=VECTOR_INDEX_ANN
+)
+creator_index_lock = asyncio.Lock()
+# One summary refresh per thread at a time; entries vanish once no request holds them
+summary_locks: "weakref.WeakValueDictionary[tuple, asyncio.Lock]" = weakref.WeakValueDictionary()
+keyword_index = CreatorKeywordIndex()
+keyword_index_lock = asyncio.Lock()
+search_cache = TieredCache(SEARCH_CACHE_SIZE, SEARCH_CACHE_TTL, SEARCH_CACHE_PATH)
+# Bumped on every creator write so cached searches never outlive the roster they ranked
+creators_version = 0
+diagnostics = Diagnostics(DIAGNOSTICS_SLOW_MS / 1000, profile_rate=DIAGNOSTICS_PROFILE_RATE) if DIAGNOSTICS else None
+entity_cache = EntityCache(
+    {"campaign": CAMPAIGN_CACHE_TTL, "creator": CREATOR_CACHE_TTL, "deal": DEAL_CACHE_TTL},
+    max_entries=ENTITY_CACHE_SIZE
+)
 
 
 # CORS middleware
@@ -46,8 +161,95 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Paged list endpoints return their next cursor in this header
+    expose_headers=["X-Next-Cursor"],
 )
 
+def route_template(request: Request) -> str:
+    """The path template a request will be routed to, so labels stay low-cardinality"""
+    for route in app.router.routes:
+        match, _ = route.matches(request.scope)
+        if match == Match.FULL:
+            return getattr(route, "path", request.url.path)
+    return "unmatched"
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    route = route_template(request)
+    token = current_route.set(route)
+    started = time.perf_counter()
+    status = 500
+    try:
+        with HTTP_IN_FLIGHT.track(), (diagnostics.profile(route) if diagnostics else nullcontext()):
+            response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_LATENCY.observe(time.perf_counter() - started, method=request.method, route=route)
+        HTTP_REQUESTS.inc(method=request.method, route=route, status=status)
+        current_route.reset(token)
+
+def collect_cache_metrics():
+    """Report cache and job queue state kept by other components at scrape time"""
+    hits = Counter("cache_hits_total", "Cache hits", ("cache",))
+    misses = Counter("cache_misses_total", "Cache misses", ("cache",))
+    saved = Counter("cache_saved_seconds_total", "Recompute time avoided by cache hits", ("cache",))
+    entries = Gauge("cache_entries", "Entries held in memory", ("cache",))
+
+    tiered = {"search": search_cache}
+    if llm.memo is not None:
+        tiered["llm"] = llm.memo
+    for name, cache in tiered.items():
+        hits.inc(cache.stats.hits, cache=name)
+        misses.inc(cache.stats.misses, cache=name)
+        saved.inc(cache.stats.saved_seconds, cache=name)
+        entries.set(len(cache.memory), cache=name)
+
+    for entity, stats in entity_cache.to_dict().items():
+        hits.inc(stats["hits"], cache=entity)
+        misses.inc(stats["misses"], cache=entity)
+        entries.set(stats["entries"], cache=entity)
+
+    audio = audio_store.stats()
+    hits.inc(audio["hits"], cache="audio")
+    misses.inc(audio["misses"], cache="audio")
+    entries.set(audio["entries"], cache="audio")
+    contract = contract_renderer.stats()
+    hits.inc(contract["hits"], cache="contract")
+    misses.inc(contract["misses"], cache="contract")
+    entries.set(contract["entries"], cache="contract")
+
+    audio_bytes = Gauge("audio_cache_bytes", "Bytes of synthesized audio on disk")
+    audio_bytes.set(audio["bytes"])
+
+    job_counts = Gauge("background_jobs", "Background jobs by state", ("state",))
+    job_counts.set(jobs.queued, state="queued")
+    job_counts.set(jobs.running, state="running")
+    return [hits, misses, saved, entries, audio_bytes, job_counts]
+
+REGISTRY.add_collector(collect_cache_metrics)
+
+@app.on_event("startup")
+async def startup():
+    await db.connect()
+    jobs.start()
+    contract_renderer.start()
+    await broker.start()
+    if diagnostics:
+        diagnostics.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    if diagnostics:
+        await diagnostics.stop()
+    await jobs.stop()
+    await broker.close()
+    await db.close()
+    await llm.close()
+    await tts.close()
+    await audio_store.flush()
+    await contract_renderer.close()
+
 # Pydantic models
 class CampaignCreate(BaseModel):
     title: str
@@ -76,10 +278,20 @@ class Creator(BaseModel):
     category: str
     location: str
     description: str
+    # Derived from followers/engagement on write; never taken from the client
+    followers_count: Optional[int] = None
+    engagement_rate: Optional[float] = None
+    engaged_followers: Optional[int] = None
+    tier: Optional[str] = None
 
 class CreatorSearchRequest(BaseModel):
     query: str
     campaign_id: str
+    # Pushed down to the database along with the campaign's platforms
+    category: Optional[str] = None
+    location: Optional[str] = None
+    background: bool = False
+    mode: Literal["ai", "keyword"] = "ai"
 
 
 class OutreachRequest(BaseModel):
@@ -107,76 +319,135 @@ class DealRequest(BaseModel):
 class ContractRequest(BaseModel):
     deal_id: str
 
+class ContractBatchRequest(BaseModel):
+    deal_ids: List[str]
+    background: bool = False
+
 
 class SimpleOutreachRequest(BaseModel):
     campaign_id: str
     creator_id: str
+    background: bool = False
 
 class SimpleOutreachResponse(BaseModel):
     email_content: str
     audio_url: str
 
+# Columns that list endpoints accept in fields= and sort=
+CAMPAIGN_FIELDS = {"id", "title", "brief", "platforms", "audience", "budget", "enhanced_brief", "created_at"}
+CREATOR_FIELDS = set(Creator.__annotations__)
+CREATOR_METRIC_SORTS = {"followers_count", "engagement_rate", "engaged_followers"}
+OUTREACH_FIELDS = {"id", "campaign_id", "creator_id", "outreach_text", "audio_url", "created_at"}
+NEGOTIATION_FIELDS = {"id", "campaign_id", "creator_id", "message", "sender", "ai_response", "audio_url", "created_at"}
+DEAL_FIELDS = {"id", "campaign_id", "creator_id", "rate", "deliverables", "platform", "timeline", "status", "created_at"}
+
 # Helper functions for Supabase operations
+async def list_from_db(key: Optional[str], build_query, sort: str, order: str, cursor: Optional[str], limit: Optional[int]):
+    """Keyset-paginated list response for any table"""
+    try:
+        return await list_response(db, build_query, key, sort, order == "desc", cursor, limit, LIST_PAGE_SIZE)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
 async def create_campaign_in_db(campaign_data: dict):
     """Create campaign in Supabase"""
     try:
-        result = supabase.table("campaigns").insert(campaign_data).execute()
+        result = await db.execute(db.table("campaigns").insert(campaign_data))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 async def get_campaign_from_db(campaign_id: str):
     """Get campaign from Supabase"""
-    try:
-        result = supabase.table("campaigns").select("*").eq("id", campaign_id).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    async def load():
+        try:
+            result = await db.execute(db.table("campaigns").select("*").eq("id", campaign_id))
+            return result.data[0] if result.data else None
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    return await entity_cache.get("campaign", campaign_id, load)
 
 async def update_campaign_in_db(campaign_id: str, update_data: dict):
     """Update campaign in Supabase"""
     try:
-        result = supabase.table("campaigns").update(update_data).eq("id", campaign_id).execute()
+        result = await db.execute(db.table("campaigns").update(update_data).eq("id", campaign_id))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        entity_cache.invalidate("campaign", campaign_id)
 
 async def delete_campaign_from_db(campaign_id: str):
     """Delete campaign from Supabase"""
     try:
-        result = supabase.table("campaigns").delete().eq("id", campaign_id).execute()
+        result = await db.execute(db.table("campaigns").delete().eq("id", campaign_id))
         return result.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        entity_cache.invalidate("campaign", campaign_id)
 
 async def create_creator_in_db(creator_data: dict):
     """Create creator in Supabase"""
     try:
-        result = supabase.table("creators").insert(creator_data).execute()
+        result = await db.execute(db.table("creators").insert(creator_data))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+async def upsert_creators_in_db(creators: List[dict]) -> List[dict]:
+    """Insert or update many creators in one round-trip"""
+    try:
+        result = await db.execute(db.table("creators").upsert(creators, on_conflict="id"))
+        return result.data or []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        for creator in creators:
+            entity_cache.invalidate("creator", creator["id"])
+
+def creators_query(category: Optional[str] = None, platform: Optional[str] = None, select: str = "*"):
+    """Creators select with the optional filters pushed down"""
+    query = db.table("creators").select(select)
+    if category:
+        query = query.ilike("category", f"%{category}%")
+    if platform:
+        query = query.ilike("platform", f"%{platform}%")
+    return query
+
 async def get_creators_from_db(category: Optional[str] = None, platform: Optional[str] = None):
     """Get creators from Supabase with filters"""
     try:
-        query = supabase.table("creators").select("*")
-        
-        if category:
-            query = query.ilike("category", f"%{category}%")
-        if platform:
-            query = query.ilike("platform", f"%{platform}%")
-            
-        result = query.execute()
-        return result.data
+        # Paged so the whole roster comes back even past PostgREST's max-rows cap
+        return [
+            creator async for creator in iter_rows(
+                db, lambda: creators_query(category, platform), "id", False, None, LIST_PAGE_SIZE
+            )
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 async def get_creator_from_db(creator_id: str):
     """Get creator from Supabase"""
+    async def load():
+        try:
+            result = await db.execute(db.table("creators").select("*").eq("id", creator_id))
+            return result.data[0] if result.data else None
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    return await entity_cache.get("creator", creator_id, load)
+
+async def get_creators_by_ids_from_db(creator_ids: List[str]):
+    """Get several creators from Supabase in one query"""
+    if not creator_ids:
+        return []
     try:
-        result = supabase.table("creators").select("*").eq("id", creator_id).execute()
-        return result.data[0] if result.data else None
+        result = await db.execute(db.table("creators").select("*").in_("id", list(set(creator_ids))))
+        return result.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
@@ -184,23 +455,35 @@ async def get_creator_from_db(creator_id: str):
 async def delete_creator_from_db(creator_id: str):
     """Delete creator from Supabase"""
     try:
-        result = supabase.table("creators").delete().eq("id", creator_id).execute()
+        result = await db.execute(db.table("creators").delete().eq("id", creator_id))
         return result.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        entity_cache.invalidate("creator", creator_id)
 
 async def create_outreach_in_db(outreach_data: dict):
     """Create outreach in Supabase"""
     try:
-        result = supabase.table("outreach").insert(outreach_data).execute()
+        result = await db.execute(db.table("outreach").insert(outreach_data))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+async def create_outreach_batch_in_db(outreach_rows: List[dict]):
+    """Create several outreach rows in Supabase with one bulk insert"""
+    if not outreach_rows:
+        return []
+    try:
+        result = await db.execute(db.table("outreach").insert(outreach_rows))
+        return result.data
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
 async def get_outreach_from_db(campaign_id: str, creator_id: str):
     """Get outreach from Supabase"""
     try:
-        result = supabase.table("outreach").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id).execute()
+        result = await db.execute(db.table("outreach").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -208,36 +491,46 @@ async def get_outreach_from_db(campaign_id: str, creator_id: str):
 async def create_deal_in_db(deal_data: dict):
     """Create deal in Supabase"""
     try:
-        result = supabase.table("deals").insert(deal_data).execute()
+        result = await db.execute(db.table("deals").insert(deal_data))
         return result.data[0] if result.data else None
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 async def get_deal_from_db(deal_id: str):
     """Get deal from Supabase"""
-    try:
-        result = supabase.table("deals").select("*").eq("id", deal_id).execute()
-        return result.data[0] if result.data else None
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    async def load():
+        try:
+            result = await db.execute(db.table("deals").select("*").eq("id", deal_id))
+            return result.data[0] if result.data else None
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    return await entity_cache.get("deal", deal_id, load)
 
 async def delete_deal_from_db(deal_id: str):
     """Delete deal from Supabase"""
     try:
-        result = supabase.table("deals").delete().eq("id", deal_id).execute()
+        result = await db.execute(db.table("deals").delete().eq("id", deal_id))
         return result.data
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    finally:
+        entity_cache.invalidate("deal", deal_id)
+
+async def submit_job(kind: str, fn, cleanup=None) -> JSONResponse:
+    """Queue work on the job manager and answer 202 with the job id"""
+    try:
+        job = await jobs.submit(kind, fn, cleanup)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job["id"], "status": job["status"], "status_url": f"/api/jobs/{job['id']}"}
+    )
 
 async def generate_simple_voice_message(text: str, campaign_id: str, creator_id: str) -> str:
     """Generate voice message using ElevenLabs API"""
     try:
-        headers = {
-            "Accept": "audio/mpeg",
-            "Content-Type": "application/json",
-            "xi-api-key": ELEVENLABS_API_KEY
-        }
-        
         # Voice settings
         voice_settings = {
             "stability": 0.75,
@@ -249,48 +542,29 @@ async def generate_simple_voice_message(text: str, campaign_id: str, creator_id:
         # Use a professional voice
         voice_id = "21m00Tcm4TlvDq8ikWAM" 
         
-        data = {
-            "text": text,
-            "model_id": "eleven_multilingual_v2",
-            "voice_settings": voice_settings
-        }
+        model_id = "eleven_multilingual_v2"
         
-        response = requests.post(
-            f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-            json=data,
-            headers=headers
+        # Identical script, voice and settings reuse the audio already on disk
+        audio_filename = await audio_store.get_or_create(
+            text,
+            voice_id,
+            model_id,
+            voice_settings,
+            lambda path: tts.synthesize_to_file(text, path, voice_id, model_id, voice_settings)
         )
-        
-        if response.status_code == 200:
-            # Save audio file
-            audio_filename = f"outreach_{campaign_id}_{creator_id}_{int(datetime.now().timestamp())}.mp3"
-            audio_dir = "static/audio"
-            os.makedirs(audio_dir, exist_ok=True)
-            audio_path = os.path.join(audio_dir, audio_filename)
-            
-            with open(audio_path, "wb") as f:
-                f.write(response.content)
-            
-            return f"/api/audio/{audio_filename}"
-        else:
-            print(f"ElevenLabs API error: {response.status_code} - {response.text}")
-            return f"/api/audio/fallback_{campaign_id}_{creator_id}.mp3"
+        return f"/api/audio/{audio_filename}"
             
     except Exception as e:
         print(f"Voice generation error: {str(e)}")
         return f"/api/audio/fallback_{campaign_id}_{creator_id}.mp3"
 
-async def generate_simple_outreach_content(campaign_data: dict, creator_data: dict) -> tuple:
-    """Generate simple outreach content using GPT-4"""
-    
+def outreach_details(campaign_data: dict, creator_data: dict) -> str:
+    """Campaign and creator section shared by the outreach prompts"""
     platform_text = ", ".join(campaign_data["platforms"]) if len(campaign_data["platforms"]) > 1 else campaign_data["platforms"][0]
-    prompt = f"""
-    Create a personalized outreach email for an influencer collaboration.
-
-    
+    return f"""
     CAMPAIGN:
     - Title: {campaign_data['title']}
-    - Brief: {campaign_data.get('enhanced_brief', campaign_data['brief'])}
+    - Brief: {campaign_data.get('enhanced_brief') or campaign_data['brief']}
     - Target Audience: {campaign_data['audience']}
     - Platforms: {platform_text}
     - Budget: {campaign_data['budget']} INR make it 50% of the budget
@@ -302,6 +576,43 @@ async def generate_simple_outreach_content(campaign_data: dict, creator_data: di
     - Followers: {creator_data['followers']}
     - Category: {creator_data['category']}
     - Location: {creator_data['location']}
+    """
+
+def fallback_outreach_content(campaign_data: dict, creator_data: dict) -> tuple:
+    """Template email and voice script used when GPT-4 is unavailable"""
+    platform_text = ", ".join(campaign_data["platforms"]) if len(campaign_data["platforms"]) > 1 else campaign_data["platforms"][0]
+
+    # Fallback email
+    fallback_email = f"""Subject: Collaboration Opportunity - {campaign_data['title']}
+
+        Hi {creator_data['name']},
+
+        I've been following your {creator_data['category']} content on {creator_data['platform']} and I'm impressed by your engagement with your audience.
+
+        We're launching {campaign_data['title']} and think you'd be a perfect fit for our campaign targeting {campaign_data['audience']}.
+
+        Campaign Details:
+        {campaign_data.get('enhanced_brief') or campaign_data['brief']}
+
+        Budget: {campaign_data['budget']} INR
+        Platform: {platform_text}
+
+        Would you be interested in discussing this collaboration opportunity?
+
+        Best regards,
+        CreatorFlow AI Team"""
+
+    fallback_voice = f"Hi {creator_data['name']}, I've been following your {creator_data['category']} content and think you'd be perfect for our {campaign_data['title']} campaign. Would you be interested in discussing a collaboration?"
+    
+    return fallback_email, fallback_voice
+
+async def generate_simple_outreach_content(campaign_data: dict, creator_data: dict) -> tuple:
+    """Generate simple outreach content using GPT-4"""
+    
+    prompt = f"""
+    Create a personalized outreach email for an influencer collaboration.
+
+    {outreach_details(campaign_data, creator_data)}
     
     Create:
     1. A professional email with subject line do not include any signature or closing in the email just greet with a thank you
@@ -317,7 +628,7 @@ async def generate_simple_outreach_content(campaign_data: dict, creator_data: di
     """
     
     try:
-        response = client.chat.completions.create(
+        response = await llm.chat(
             model="gpt-4o-mini",
             messages=[
                 {
@@ -336,96 +647,64 @@ async def generate_simple_outreach_content(campaign_data: dict, creator_data: di
         
     except Exception as e:
         print(f"GPT-4 outreach generation error: {str(e)}")
-        
-        # Fallback email
-        fallback_email = f"""Subject: Collaboration Opportunity - {campaign_data['title']}
-
-        Hi {creator_data['name']},
-
-        I've been following your {creator_data['category']} content on {creator_data['platform']} and I'm impressed by your engagement with your audience.
-
-        We're launching {campaign_data['title']} and think you'd be a perfect fit for our campaign targeting {campaign_data['audience']}.
-
-        Campaign Details:
-        {campaign_data.get('enhanced_brief', campaign_data['brief'])}
-
-        Budget: {campaign_data['budget']} INR
-        Platform: {platform_text}
+        return fallback_outreach_content(campaign_data, creator_data)
 
-        Would you be interested in discussing this collaboration opportunity?
+OUTREACH_EMAIL_MARKER = "===EMAIL==="
 
-        Best regards,
-        CreatorFlow AI Team"""
+async def stream_simple_outreach_content(campaign_data: dict, creator_data: dict):
+    """Yield ("voice_script" | "email", text) pieces as GPT-4 writes them"""
+    prompt = f"""
+    Create a personalized outreach message for an influencer collaboration.
 
-        fallback_voice = f"Hi {creator_data['name']}, I've been following your {creator_data['category']} content and think you'd be perfect for our {campaign_data['title']} campaign. Would you be interested in discussing a collaboration?"
-        
-        return fallback_email, fallback_voice
+    {outreach_details(campaign_data, creator_data)}
     
-async def generate_conversation_summary(messages: list) -> str:
-    """Generate AI summary of negotiation conversation using GPT-4"""
-    conversation_text = "\n".join([f"{msg['message_type']}: {msg['content']}" for msg in messages])
+    Write, in this order and as plain text:
+    1. A voice message script for about 40 seconds when spoken
+    2. A line containing only {OUTREACH_EMAIL_MARKER}
+    3. A professional email with subject line do not include any signature or closing in the email just greet with a thank you
     
-    prompt = f"""
-    Summarize this influencer negotiation conversation:
-
-    {conversation_text}
-
-    Include:
-    - Key negotiation points discussed
-    - Agreed rates and deliverables
-    - Timeline and next steps
-    - Overall outcome (deal closed, ongoing, declined)
+    Make it personal, professional, and engaging. Do not add headings or any other text.
     """
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert conversation summarizer. Always provide a concise and structured summary."
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.5,
-            max_tokens=500
-        )
-
-        summary = response.choices[0].message.content.strip()
-        return summary
-
-    except Exception as e:
-        print(f"GPT-4 conversation summary generation error: {str(e)}")
-        return "Unable to generate summary at the moment. Please try again later."
-
-
-from reportlab.pdfgen import canvas
-import os
-
-def create_contract_pdf(content: str, deal_id: str) -> str:
-    os.makedirs("static/contracts", exist_ok=True)
-    pdf_path = f"static/contracts/{deal_id}.pdf"
-
-    c = canvas.Canvas(pdf_path)
-    text_object = c.beginText(50, 800)  # Starting position
-
-    # Set font
-    text_object.setFont("Helvetica", 12)
-
-    # Add lines of text
-    for line in content.strip().split("\n"):
-        text_object.textLine(line.strip())
-
-    c.drawText(text_object)
-    c.save()
-
-    return pdf_path
-
+    # The voice script comes first so synthesis can start while the email is still being written
+    section = "voice_script"
+    pending = ""
+    async for delta in llm.stream_chat(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are an expert at writing personalized outreach emails for influencer marketing."},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=0.7,
+        max_tokens=1000
+    ):
+        if section == "email":
+            yield "email", delta
+            continue
+
+        pending += delta
+        if OUTREACH_EMAIL_MARKER in pending:
+            voice_part, email_part = pending.split(OUTREACH_EMAIL_MARKER, 1)
+            if voice_part:
+                yield "voice_script", voice_part
+            section = "email"
+            if email_part.strip():
+                yield "email", email_part.lstrip()
+            continue
+
+        # Hold back enough characters to catch a marker split across deltas
+        safe = len(pending) - len(OUTREACH_EMAIL_MARKER) + 1
+        if safe > 0:
+            yield "voice_script", pending[:safe]
+            pending = pending[safe:]
+
+    if section == "voice_script" and pending:
+        yield "voice_script", pending
 
 @app.get("/api/creators/count")
 async def get_creators_count():
     try:
-        response = supabase.table("creators").select("id", count="exact").execute()
+        response = await db.execute(db.table("creators").select("id", count="exact"))
         return JSONResponse(content={"count": response.count or 0})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
@@ -473,17 +752,22 @@ async def enhance_campaign_brief(campaign_id: str):
     Please rewrite it as an engaging influencer brief and do not include the brand name if it is not mentioned.
     """
 
-    response = client.chat.completions.create(
+    # Unchanged campaigns produce the same prompt, so the memoized rewrite is served;
+    # sampled at temperature 0 so the cached rewrite is the one a fresh call would give
+    response = await llm.chat(
+        memoize=True,
         model="gpt-4o-mini",
         messages=[
             {"role": "system", "content": "You are a seasoned brand strategist who rewrites campaign briefs to make them clear, exciting, and inspiring for modern creators to collaborate."},
             {"role": "user", "content": prompt}
-        ]
+        ],
+        temperature=0
     )
 
     enhanced_brief = response.choices[0].message.content.strip()
 
     await update_campaign_in_db(campaign_id, {"enhanced_brief": enhanced_brief})
+    await search_cache.delete_prefix(f"{campaign_id}:")
     
     return {"enhanced_brief": enhanced_brief}
 
@@ -497,13 +781,25 @@ async def get_campaign(campaign_id: str):
     return Campaign(**campaign_data)
 
 @app.get("/api/campaigns")
-async def get_all_campaigns():
+async def get_all_campaigns(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    order: Literal["asc", "desc"] = "asc",
+    platform: Optional[str] = None
+):
     """Get all campaigns"""
-    try:
-        result = supabase.table("campaigns").select("*").execute()
-        return {"campaigns": result.data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    check_sort(sort, {"created_at", "title", "id"})
+    select = parse_fields(fields, CAMPAIGN_FIELDS, sort)
+
+    def build_query():
+        query = db.table("campaigns").select(select)
+        if platform:
+            query = query.contains("platforms", [platform])
+        return query
+
+    return await list_from_db("campaigns", build_query, sort, order, cursor, limit)
 
 @app.delete("/api/campaigns/{campaign_id}")
 async def delete_campaign(campaign_id: str):
@@ -519,26 +815,134 @@ async def delete_campaign(campaign_id: str):
 @app.get("/api/creators", response_model=List[Creator])
 async def get_creators(
     category: Optional[str] = None,
-    platform: Optional[str] = None
+    platform: Optional[str] = None,
+    location: Optional[str] = None,
+    min_followers: Optional[int] = Query(None, ge=0),
+    max_followers: Optional[int] = Query(None, ge=0),
+    min_engagement: Optional[float] = Query(None, ge=0, description="Engagement rate in percent"),
+    max_engagement: Optional[float] = Query(None, ge=0, description="Engagement rate in percent"),
+    tier: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "id",
+    order: Literal["asc", "desc"] = "asc"
 ):
-    """Get list of creators with optional filters"""
-    creators_data = await get_creators_from_db(category, platform)
-    
-    return [Creator(**creator) for creator in creators_data]
+    """Get list of creators with optional filters; the next page cursor is sent in X-Next-Cursor"""
+    check_sort(sort, {"id", "name", "handle"} | CREATOR_METRIC_SORTS)
+    select = parse_fields(fields, CREATOR_FIELDS, sort)
+    if tier and tier not in {name for name, _ in TIERS}:
+        raise HTTPException(status_code=400, detail=f"Unknown tier; use one of: {', '.join(name for name, _ in TIERS)}")
+
+    def build_query():
+        query = creators_query(category, platform, select)
+        if location:
+            query = query.ilike("location", f"%{location}%")
+        if min_followers is not None:
+            query = query.gte("followers_count", min_followers)
+        if max_followers is not None:
+            query = query.lte("followers_count", max_followers)
+        if min_engagement is not None:
+            query = query.gte("engagement_rate", min_engagement)
+        if max_engagement is not None:
+            query = query.lte("engagement_rate", max_engagement)
+        if tier:
+            query = query.eq("tier", tier)
+        if sort in CREATOR_METRIC_SORTS:
+            # Keyset cursors cannot step over NULLs, so unparsed rows are left out of metric sorts
+            query = query.not_.is_(sort, "null")
+        return query
+
+    return await list_from_db(None, build_query, sort, order, cursor, limit)
 
 @app.post("/api/creators")
 async def create_creator(creator: Creator):
     """Create a new creator"""
-    creator_data = creator.to_dict()
+    creator_data = normalize_creator(creator.model_dump())
     if not creator_data.get("id"):
         creator_data["id"] = str(uuid.uuid4())
     
     result = await create_creator_in_db(creator_data)
     if not result:
         raise HTTPException(status_code=500, detail="Failed to create creator")
+
+    try:
+        await creator_index.upsert([result])
+    except Exception as e:
+        print(f"Failed to index creator: {str(e)}")
+    if keyword_index.ready:
+        keyword_index.add(result)
+    await invalidate_creator_searches()
     
     return Creator(**result)
 
+def validate_creator_row(record: dict) -> dict:
+    """Check an imported row against the Creator model; rows without an id get one"""
+    record = {k: v for k, v in record.items() if k in CREATOR_FIELDS}
+    if not record.get("id"):
+        record["id"] = str(uuid.uuid4())
+    try:
+        return normalize_creator(Creator(**record).model_dump())
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+async def write_creator_batch(rows: List[tuple]) -> List[tuple]:
+    """Upsert one import batch, isolating bad rows if the batch as a whole is rejected"""
+    creators = [data for _, data in rows]
+    try:
+        stored = await upsert_creators_in_db(creators)
+        failures = []
+    except HTTPException:
+        stored, failures = [], []
+        for row, data in rows:
+            try:
+                stored.extend(await upsert_creators_in_db([data]))
+            except HTTPException as e:
+                failures.append((row, e.detail))
+
+    if stored:
+        try:
+            # Saved once when the import finishes
+            await creator_index.upsert(stored, save=False)
+        except Exception as e:
+            print(f"Failed to index imported creators: {str(e)}")
+        if keyword_index.ready:
+            for creator in stored:
+                keyword_index.add(creator)
+    return failures
+
+@app.post("/api/creators/import")
+async def import_creators(
+    file: UploadFile = File(...),
+    format: Optional[Literal["csv", "ndjson"]] = None
+):
+    """Bulk import creators from a CSV (with header) or NDJSON upload"""
+    file_format = format
+    if file_format is None:
+        name = (file.filename or "").lower()
+        if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (file.content_type or ""):
+            file_format = "ndjson"
+        elif name.endswith(".csv") or "csv" in (file.content_type or ""):
+            file_format = "csv"
+        else:
+            raise HTTPException(status_code=400, detail="Cannot tell the file format; pass format=csv or format=ndjson")
+
+    records = iter_csv_records(file.read) if file_format == "csv" else iter_ndjson_records(file.read)
+    try:
+        report = await import_records(
+            records,
+            validate_creator_row,
+            write_creator_batch,
+            batch_size=CREATOR_IMPORT_BATCH_SIZE,
+            concurrency=CREATOR_IMPORT_CONCURRENCY
+        )
+    finally:
+        if creator_index.ready:
+            await creator_index.save()
+        await invalidate_creator_searches()
+
+    return {"format": file_format, **report}
+
 @app.delete("/api/creators/{creator_id}")
 async def delete_creator(creator_id: str):
     """Delete creator"""
@@ -547,131 +951,176 @@ async def delete_creator(creator_id: str):
         raise HTTPException(status_code=404, detail="Creator not found")
     
     await delete_creator_from_db(creator_id)
+    try:
+        await creator_index.remove([creator_id])
+    except Exception as e:
+        # The row is gone; a stale vector only costs a lookup that finds nothing
+        print(f"Failed to remove creator from index: {str(e)}")
+    keyword_index.remove(creator_id)
+    await invalidate_creator_searches()
     return {"message": "Creator deleted successfully"}
 
 
-@app.post("/api/creators/search")
-async def ai_search_creators(request: CreatorSearchRequest):
-    """Advanced AI-powered semantic search for optimal creators"""
-    campaign_id = request.campaign_id
-    query = request.query
-    # Get campaign details for context
-    campaign_data = await get_campaign_from_db(campaign_id)
-    if not campaign_data:
-        raise HTTPException(status_code=404, detail="Campaign not found")
-    
-    # Get all available creators
-    all_creators = await get_creators_from_db()
+async def ensure_keyword_index():
+    """Build the creator keyword index on first use"""
+    if keyword_index.ready:
+        return
+    async with keyword_index_lock:
+        if not keyword_index.ready:
+            keyword_index.build(await get_creators_from_db())
+
+async def keyword_search_creators(campaign_data: dict, query: str, limit: int = 15):
+    """Rank creators with BM25 over the keyword index; no LLM involved"""
+    await ensure_keyword_index()
+
+    ranked = keyword_index.search(campaign_terms(campaign_data, query), limit)
+    top_score = ranked[0][1] if ranked else 0.0
+
+    scored_creators = []
+    for creator_id, score in ranked:
+        creator_with_score = keyword_index.documents[creator_id].copy()
+        creator_with_score["match_score"] = round(100 * score / top_score)
+        scored_creators.append(creator_with_score)
+
+    fallback_semantic = list(set([
+        *query.lower().split()[:2],
+        *[c['category'] for c in scored_creators[:3]]
+    ]))[:5]
+
+    return {
+        "results": scored_creators,
+        "query_processed": query,
+        "semantic_matches": fallback_semantic
+    }
+
+def search_cache_key(campaign_data: dict, query: str, category: Optional[str] = None, location: Optional[str] = None) -> str:
+    """Cache key for a search: campaign, normalized query, filters, brief and roster version"""
+    normalized_query = " ".join(query.lower().split())
+    filters = "|".join((value or "").strip().lower() for value in (category, location))
+    brief_hash = hashlib.sha256((campaign_data.get("enhanced_brief") or "").encode()).hexdigest()
+    digest = hashlib.sha256(f"{normalized_query}|{filters}|{brief_hash}|{creators_version}".encode()).hexdigest()
+    return f"{campaign_data['id']}:{digest}"
+
+async def invalidate_creator_searches():
+    """Drop every cached search after the creators table changes"""
+    global creators_version
+    creators_version += 1
+    await search_cache.clear()
+
+async def ensure_creator_index():
+    """Load or build the creator embedding index on first use"""
+    if creator_index.ready:
+        return
+    async with creator_index_lock:
+        if creator_index.ready:
+            return
+        if creator_index.load():
+            # A saved index is only trusted if it still covers the whole roster
+            response = await db.execute(db.table("creators").select("id", count="exact"))
+            if response.count == len(creator_index):
+                return
+        await creator_index.build(await get_creators_from_db())
+
+async def prefilter_creators(platforms: List[str], category: Optional[str], location: Optional[str]) -> List[dict]:
+    """The few columns the heuristic needs, for creators passing the pushed-down predicates"""
+    platform_filter = platform_predicate(platforms)
+
+    def build_query():
+        query = creators_query(category, None, PREFILTER_COLUMNS)
+        if location:
+            query = query.ilike("location", f"%{location}%")
+        if platform_filter:
+            query = query.or_(platform_filter)
+        return query
+
+    try:
+        return [row async for row in iter_rows(db, build_query, "id", False, None, LIST_PAGE_SIZE)]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+async def retrieve_creator_candidates(campaign_data: dict, query: str, category: Optional[str] = None, location: Optional[str] = None):
+    """Narrow the roster to the creators worth LLM scoring
+
+    Campaign platforms and the request's category and location are applied in the
+    database; the survivors are ranked by a cheap local heuristic and only the top
+    SEARCH_CANDIDATES are returned, with counts describing the cut.
+    """
+    candidates = await prefilter_creators(campaign_data["platforms"], category, location)
+    if not candidates and campaign_data["platforms"]:
+        # Platform names are free text on both sides; a mismatch should not empty the search
+        print(f"No creators on {', '.join(campaign_data['platforms'])}; pre-filtering without platforms")
+        candidates = await prefilter_creators([], category, location)
+
+    search_text = " ".join([
+        query,
+        campaign_data["title"],
+        campaign_data.get("enhanced_brief") or campaign_data["brief"],
+        campaign_data["audience"],
+        " ".join(campaign_data["platforms"])
+    ])
+    candidate_ids = [c["id"] for c in candidates]
+    try:
+        await ensure_creator_index()
+        # Nearest neighbours among the pre-filtered ids; uses the ANN graph when it is enabled
+        semantic = dict(await creator_index.search(search_text, SEARCH_RETRIEVAL_POOL, candidate_ids))
+    except Exception as e:
+        print(f"Creator index unavailable, pre-filtering on keywords and engagement: {str(e)}")
+        semantic = {}
+    await ensure_keyword_index()
+    allowed = set(candidate_ids)
+    keyword = dict([
+        (creator_id, score)
+        for creator_id, score in keyword_index.search(campaign_terms(campaign_data, query))
+        if creator_id in allowed
+    ][:SEARCH_RETRIEVAL_POOL])
+
+    # Only what either index retrieved is ranked; with neither, engagement alone decides
+    pool = [c for c in candidates if c["id"] in semantic or c["id"] in keyword] or candidates
+    ranked = rank_candidates(pool, semantic, keyword)
+    survivors = ranked[:SEARCH_CANDIDATES]
+    stats = {
+        "matched": len(candidates),
+        "retrieved": len(pool),
+        "scored": len(survivors),
+        "top_k": SEARCH_CANDIDATES,
+        "cutoff_score": round(survivors[-1][1], 4) if survivors else None
+    }
+    print(
+        f"Search pre-filter for campaign {campaign_data['id']}: {stats['matched']} creators matched, "
+        f"{stats['retrieved']} retrieved, scoring top {stats['scored']} (top_k={SEARCH_CANDIDATES}, cutoff score {stats['cutoff_score']})"
+    )
+
+    creators = {c["id"]: c for c in await get_creators_by_ids_from_db([creator_id for creator_id, _ in survivors])}
+    return [creators[creator_id] for creator_id, _ in survivors if creator_id in creators], stats
+
+async def run_creator_search(campaign_data: dict, query: str, category: Optional[str] = None, location: Optional[str] = None):
+    """Score creators against a campaign and search query"""
+    cache_key = search_cache_key(campaign_data, query, category, location)
+    cached = await search_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    started = time.perf_counter()
+
+    # Retrieve the closest creators before any LLM scoring
+    all_creators, prefilter = await retrieve_creator_candidates(campaign_data, query, category, location)
     if not all_creators:
         return {
             "results": [],
             "query_processed": query,
-            "semantic_matches": []
+            "semantic_matches": [],
+            "prefilter": prefilter
         }
     
     try:
-        creators_text = ""
-        for idx, creator in enumerate(all_creators):
-            creators_text += f"""
-            Creator {idx + 1}:
-            - Name: {creator['name']}
-            - Handle: {creator['handle']}
-            - Platform: {creator['platform']}
-            - Followers: {creator['followers']}
-            - Engagement: {creator['engagement']}
-            - Category: {creator['category']}
-            - Location: {creator['location']}
-            - Description: {creator['description']}
-            """
-        
-        comprehensive_prompt = f"""
-        You are an elite influencer marketing AI analyst. Analyze this campaign and score ALL creators in a single response.
-        
-        CAMPAIGN DETAILS:
-        - Title: {campaign_data['title']}
-        - Brief: {campaign_data.get('enhanced_brief', campaign_data['brief'])}
-        - Target Audience: {campaign_data['audience']}
-        - Platforms: {', '.join(campaign_data['platforms'])}
-        - Budget: {campaign_data['budget']}
-        - Search Query: {query}
-        
-        CREATORS TO ANALYZE:
-        {creators_text}
-        
-        SCORING CRITERIA (Total 100 points):
-        1. Audience Alignment (0-25): How well their audience matches target demographics
-        2. Content Relevance (0-25): Alignment with content themes and industry vertical
-        3. Platform Optimization (0-20): Platform expertise and content format mastery
-        4. Engagement Quality (0-15): Authentic engagement vs follower count ratio
-        5. Brand Safety (0-10): Professional reputation and content appropriateness
-        6. Geographic Relevance (0-5): Location alignment with campaign needs
-        
-        ADDITIONAL SCORING FACTORS:
-        - Growth Potential Bonus: High (+10), Medium (+5), Low (0)
-        - Collaboration Fit Bonus: Excellent (+15), Good (+10), Fair (+5), Poor (0)
-        - Performance Bonus: Above Average (+8), Average (+4), Below Average (0)
-        - Risk Penalty: -3 per risk factor
-        
-        Return a JSON object with this EXACT structure:
-        {{
-            "campaign_requirements": {{
-                "target_demographics": ["demographic1", "demographic2"],
-                "content_style": ["style1", "style2"],
-                "industry_vertical": "primary industry",
-                "platform_priorities": ["platform1", "platform2"],
-                "content_themes": ["theme1", "theme2", "theme3"]
-            }},
-            "creator_scores": [
-                {{
-                    "creator_index": 0,
-                    "match_score": 85,
-                    "detailed_scores": {{
-                        "audience_alignment": 22,
-                        "content_relevance": 20,
-                        "platform_optimization": 18,
-                        "engagement_quality": 14,
-                        "brand_safety": 8,
-                        "geographic_relevance": 3
-                    }},
-                    "bonuses": {{
-                        "growth_potential": 10,
-                        "collaboration_fit": 15,
-                        "performance": 8
-                    }},
-                    "penalties": {{
-                        "risk_factors": 0
-                    }},
-                    "strengths": ["strength1", "strength2"],
-                    "collaboration_fit": "excellent",
-                    "growth_potential": "high",
-                    "estimated_performance": "above_average",
-                    "risk_factors": [],
-                    "optimal_content_types": ["content_type1", "content_type2"]
-                }}
-            ],
-            "semantic_matches": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
-        }}
-        
-        IMPORTANT: 
-        - Score ALL creators provided (creator_index 0 to {len(all_creators)-1})
-        - Calculate match_score as: base_score + bonuses - penalties (max 100)
-        - Include 5-7 semantic keywords that represent the search intent
-        - Ensure valid JSON format
-        """
-        
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a precise influencer analytics AI. Always return valid JSON only. No explanations or additional text."},
-                {"role": "user", "content": comprehensive_prompt}
-            ],
-            temperature=0.1,
-            max_tokens=4000 
+        analysis_result = await score_creators(
+            llm,
+            campaign_data,
+            query,
+            all_creators,
+            chunk_size=SCORING_CHUNK_SIZE,
+            retries=SCORING_CHUNK_RETRIES
         )
         
-        import json
-        analysis_result = json.loads(response.choices[0].message.content.strip())
-        
         # Process results and combine with creator data
         scored_creators = []
         creator_scores = analysis_result.get("creator_scores", [])
@@ -695,94 +1144,115 @@ async def ai_search_creators(request: CreatorSearchRequest):
         scored_creators.sort(key=lambda x: x.get("match_score", 0), reverse=True)
         semantic_matches = analysis_result.get("semantic_matches", [])
         
-        return {
+        # Creators in chunks that failed every retry are missing from results; say which
+        scored_indexes = {score_data.get("creator_index") for score_data in creator_scores}
+        search_result = {
             "results": scored_creators,
             "query_processed": query,
-            "semantic_matches": semantic_matches
+            "semantic_matches": semantic_matches,
+            "prefilter": prefilter,
+            "failed_chunks": analysis_result.get("failed_chunks", 0),
+            "unscored": [c["id"] for i, c in enumerate(all_creators) if i not in scored_indexes]
         }
+        # A partial ranking would hide the unscored creators for the whole TTL
+        if not search_result["failed_chunks"]:
+            await search_cache.set(cache_key, search_result, cost=time.perf_counter() - started)
+        return search_result
         
     except Exception as e:
         print(f"LLM call failed for AI Search: {str(e)}")
         
-        # Enhanced fallback with multi-criteria matching
-        query_words = set(query.lower().split())
-        campaign_words = set((
-            campaign_data['title'] + " " + 
-            campaign_data.get('enhanced_brief', campaign_data['brief']) + " " +
-            campaign_data['audience'] + " " +
-            " ".join(campaign_data['platforms'])
-        ).lower().split())
-        
-        scored_creators = []
-        for creator in all_creators:
-            creator_text = (
-                creator['name'] + " " + 
-                creator['description'] + " " + 
-                creator['category'] + " " + 
-                creator['platform'] + " " +
-                creator['location']
-            ).lower()
-            
-            creator_words = set(creator_text.split())
-            
-            # Calculate multiple match scores
-            exact_matches = len(query_words.intersection(creator_words))
-            campaign_matches = len(campaign_words.intersection(creator_words))
-            platform_match = 1 if creator['platform'].lower() in [p.lower() for p in campaign_data['platforms']] else 0
-            
-            total_match_score = (exact_matches * 3) + (campaign_matches * 2) + (platform_match * 5)
-            
-            if total_match_score > 0:
-                creator_with_score = creator.copy()
-                creator_with_score["match_score"] = min(100, total_match_score * 5)
-                scored_creators.append(creator_with_score)
-        
-        # Sort by match score
-        scored_creators.sort(key=lambda x: x.get("match_score", 0), reverse=True)
-        
-        fallback_semantic = list(set([
-            *query.lower().split()[:2],
-            *[c['category'] for c in scored_creators[:3]]
-        ]))[:5]
-        
-        return {
-            "results": scored_creators[:15],
-            "query_processed": query,
-            "semantic_matches": fallback_semantic
-        }
+        return {**await keyword_search_creators(campaign_data, query), "prefilter": prefilter}
 
-# 3. OUTREACH ROUTES
-@app.post("/api/outreach", response_model=SimpleOutreachResponse)
-async def generate_outreach(request: SimpleOutreachRequest):
-    """Generate AI-powered outreach email and voice message"""
-    
-    # Get campaign data
+@app.post("/api/creators/search")
+async def ai_search_creators(request: CreatorSearchRequest):
+    """Advanced AI-powered semantic search for optimal creators"""
+    # Get campaign details for context
     campaign_data = await get_campaign_from_db(request.campaign_id)
     if not campaign_data:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    
-    # Get creator data
-    creator_data = await get_creator_from_db(request.creator_id)
-    if not creator_data:
-        raise HTTPException(status_code=404, detail="Creator not found")
-    
+
+    if request.mode == "keyword":
+        return await keyword_search_creators(campaign_data, request.query)
+
+    if request.background:
+        return await submit_job(
+            "creator_search",
+            lambda ctx: run_creator_search(campaign_data, request.query, request.category, request.location)
+        )
+
+    return await run_creator_search(campaign_data, request.query, request.category, request.location)
+
+@app.get("/api/creators/search/cache")
+async def get_search_cache_stats():
+    """Search result cache hits, misses and latency saved"""
+    return {**search_cache.stats.to_dict(), "entries": len(search_cache.memory)}
+
+@app.get("/api/cache/audio")
+async def get_audio_cache_stats():
+    """Voice audio store hits, misses and disk usage"""
+    return audio_store.stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus text exposition of request, dependency, token and cache metrics"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/debug/diagnostics")
+async def get_diagnostics(limit: int = Query(20, ge=1, le=200)):
+    """Event loop lag, recent blocked-loop stacks and sampled per-route profiles"""
+    if not diagnostics:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled; set DIAGNOSTICS=true")
+    return diagnostics.report(limit)
+
+@app.delete("/api/debug/diagnostics")
+async def reset_diagnostics():
+    """Clear collected lag samples, stalls and profiles"""
+    if not diagnostics:
+        raise HTTPException(status_code=404, detail="Diagnostics are disabled; set DIAGNOSTICS=true")
+    diagnostics.reset()
+    return {"message": "Diagnostics reset"}
+
+@app.get("/api/cache/llm")
+async def get_llm_cache_stats():
+    """Memoized LLM completion hits, misses and latency saved"""
+    if llm.memo is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm.memo.stats.to_dict(), "entries": len(llm.memo.memory)}
+
+@app.get("/api/cache/contracts")
+async def get_contract_cache_stats():
+    """Contract PDF renders skipped because the deal and campaign were unchanged"""
+    return contract_renderer.stats()
+
+@app.get("/api/cache/entities")
+async def get_entity_cache_stats():
+    """Campaign, creator and deal cache hits and misses"""
+    return entity_cache.to_dict()
+
+# 3. OUTREACH ROUTES
+async def run_outreach(campaign_data: dict, creator_data: dict) -> SimpleOutreachResponse:
+    """Generate, voice and store outreach for one creator"""
+    campaign_id = campaign_data["id"]
+    creator_id = creator_data["id"]
+
     # Generate content
     email_content, voice_script = await generate_simple_outreach_content(campaign_data, creator_data)
     
     # Generate voice message
-    audio_url = await generate_simple_voice_message(voice_script, request.campaign_id, request.creator_id)
+    audio_url = await generate_simple_voice_message(voice_script, campaign_id, creator_id)
     
     # Store in database using your existing schema
     outreach_data = {
-        "campaign_id": request.campaign_id,
-        "creator_id": request.creator_id,
+        "campaign_id": campaign_id,
+        "creator_id": creator_id,
         "outreach_text": email_content,  # This maps to your 'outreach_text' column
         "audio_url": audio_url,
         "created_at": datetime.now().isoformat()
     }
     
     try:
-        result = supabase.table("outreach").insert(outreach_data).execute()
+        result = await db.execute(db.table("outreach").insert(outreach_data))
         if not result.data:
             raise HTTPException(status_code=500, detail="Failed to create outreach")
     except Exception as e:
@@ -793,11 +1263,117 @@ async def generate_outreach(request: SimpleOutreachRequest):
         audio_url=audio_url
     )
 
+@app.post("/api/outreach", response_model=SimpleOutreachResponse)
+async def generate_outreach(request: SimpleOutreachRequest):
+    """Generate AI-powered outreach email and voice message"""
+    
+    # Get campaign data
+    campaign_data = await get_campaign_from_db(request.campaign_id)
+    if not campaign_data:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    # Get creator data
+    creator_data = await get_creator_from_db(request.creator_id)
+    if not creator_data:
+        raise HTTPException(status_code=404, detail="Creator not found")
+
+    if request.background:
+        async def outreach_job(ctx):
+            return (await run_outreach(campaign_data, creator_data)).model_dump()
+
+        return await submit_job("outreach", outreach_job)
+    
+    return await run_outreach(campaign_data, creator_data)
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/outreach/stream")
+async def stream_outreach(request: SimpleOutreachRequest):
+    """Stream outreach generation as Server-Sent Events
+
+    Events: voice_script and email deltas as they are written, audio once the
+    voice message is synthesized, then done with the stored outreach.
+    """
+    campaign_data = await get_campaign_from_db(request.campaign_id)
+    if not campaign_data:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    
+    creator_data = await get_creator_from_db(request.creator_id)
+    if not creator_data:
+        raise HTTPException(status_code=404, detail="Creator not found")
+
+    async def events():
+        # Sent at once so the client sees the stream open before the first token
+        yield ": generating\n\n"
+
+        email_content = ""
+        voice_script = ""
+        voice_task = None
+        try:
+            try:
+                async for section, text in stream_simple_outreach_content(campaign_data, creator_data):
+                    if section == "voice_script":
+                        voice_script += text
+                        yield sse_event("voice_script", {"delta": text})
+                        continue
+                    if voice_task is None and voice_script.strip():
+                        # The script is complete; synthesize while the email keeps streaming
+                        voice_task = asyncio.create_task(
+                            generate_simple_voice_message(voice_script.strip(), request.campaign_id, request.creator_id)
+                        )
+                    email_content += text
+                    yield sse_event("email", {"delta": text})
+            except Exception as e:
+                print(f"GPT-4 outreach streaming error: {str(e)}")
+
+            if not email_content.strip() or not voice_script.strip():
+                fallback_email, fallback_voice = fallback_outreach_content(campaign_data, creator_data)
+                if not email_content.strip():
+                    email_content = fallback_email
+                    yield sse_event("email", {"delta": fallback_email})
+                if not voice_script.strip():
+                    voice_script = fallback_voice
+                    yield sse_event("voice_script", {"delta": fallback_voice})
+
+            if voice_task is None:
+                voice_task = asyncio.create_task(
+                    generate_simple_voice_message(voice_script.strip(), request.campaign_id, request.creator_id)
+                )
+            audio_url = await voice_task
+            yield sse_event("audio", {"audio_url": audio_url})
+
+            try:
+                await create_outreach_in_db({
+                    "campaign_id": request.campaign_id,
+                    "creator_id": request.creator_id,
+                    "outreach_text": email_content.strip(),
+                    "audio_url": audio_url,
+                    "created_at": datetime.now().isoformat()
+                })
+            except HTTPException as e:
+                yield sse_event("error", {"detail": e.detail})
+                return
+
+            yield sse_event("done", {"email_content": email_content.strip(), "audio_url": audio_url})
+        finally:
+            # A client that disconnects mid-stream must not leave synthesis running unobserved
+            if voice_task is not None and not voice_task.done():
+                voice_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await voice_task
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/api/outreach/{campaign_id}/{creator_id}")
 async def get_outreach(campaign_id: str, creator_id: str):
     """Get outreach details"""
     try:
-        result = supabase.table("outreach").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id).execute()
+        result = await db.execute(db.table("outreach").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id))
         if not result.data:
             raise HTTPException(status_code=404, detail="Outreach not found")
         
@@ -815,64 +1391,114 @@ async def get_outreach(campaign_id: str, creator_id: str):
 
 
 @app.get("/api/outreach/campaign/{campaign_id}")
-async def get_campaign_outreach(campaign_id: str):
+async def get_campaign_outreach(
+    campaign_id: str,
+    creator_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    order: Literal["asc", "desc"] = "asc"
+):
     """Get all outreach for a campaign"""
-    try:
-        result = supabase.table("outreach").select("*").eq("campaign_id", campaign_id).execute()
-        return {"outreach": result.data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    check_sort(sort, {"created_at", "id"})
+    select = parse_fields(fields, OUTREACH_FIELDS, sort)
+
+    def build_query():
+        query = db.table("outreach").select(select).eq("campaign_id", campaign_id)
+        if creator_id:
+            query = query.eq("creator_id", creator_id)
+        return query
+
+    return await list_from_db("outreach", build_query, sort, order, cursor, limit)
+
+
+async def run_batch_outreach(campaign_data: dict, creator_ids: List[str], on_result=None) -> List[dict]:
+    """Generate outreach for many creators concurrently and store it with one bulk insert"""
+    campaign_id = campaign_data["id"]
+    creators = {c["id"]: c for c in await get_creators_by_ids_from_db(creator_ids)}
+    slots = asyncio.Semaphore(BATCH_OUTREACH_CONCURRENCY)
+
+    async def generate(creator_id: str):
+        result = await generate_one(creator_id)
+        # Failures are final now; successes are reported once they are stored
+        if on_result and result["status"] != "success":
+            await on_result(result)
+        return result
+
+    async def generate_one(creator_id: str):
+        creator_data = creators.get(creator_id)
+        if not creator_data:
+            return {
+                "creator_id": creator_id,
+                "status": "error",
+                "message": "Creator not found"
+            }
+        try:
+            async with slots:
+                email_content, voice_script = await generate_simple_outreach_content(campaign_data, creator_data)
+        except Exception as e:
+            return {
+                "creator_id": creator_id,
+                "status": "error",
+                "message": str(e)
+            }
+
+        # Voice is skipped for batch to save API costs
+        return {
+            "creator_id": creator_id,
+            "status": "success",
+            "outreach": {
+                "campaign_id": campaign_id,
+                "creator_id": creator_id,
+                "outreach_text": email_content,
+                "audio_url": f"/api/audio/batch_outreach_{campaign_id}_{creator_id}.mp3",
+                "created_at": datetime.now().isoformat()
+            }
+        }
 
+    results = await asyncio.gather(*(generate(creator_id) for creator_id in creator_ids))
+
+    generated = [r for r in results if r["status"] == "success"]
+    outreach_rows = [r.pop("outreach") for r in generated]
+    try:
+        await create_outreach_batch_in_db(outreach_rows)
+    except HTTPException:
+        # Stored one at a time so a bad row only fails its own creator
+        for r, row in zip(generated, outreach_rows):
+            try:
+                await create_outreach_batch_in_db([row])
+            except HTTPException as e:
+                r["status"] = "error"
+                r["message"] = e.detail
+
+    if on_result:
+        for r in generated:
+            await on_result(r)
+    return results
 
 @app.post("/api/outreach/batch")
-async def generate_batch_outreach(campaign_id: str, creator_ids: List[str]):
+async def generate_batch_outreach(campaign_id: str, creator_ids: List[str], background: bool = False):
     """Generate outreach for multiple creators"""
     
     campaign_data = await get_campaign_from_db(campaign_id)
     if not campaign_data:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    
-    results = []
-    
-    for creator_id in creator_ids:
-        try:
-            creator_data = await get_creator_from_db(creator_id)
-            if not creator_data:
-                results.append({
-                    "creator_id": creator_id,
-                    "status": "error",
-                    "message": "Creator not found"
-                })
-                continue
-            
-            # Generate content
-            email_content, voice_script = await generate_simple_outreach_content(campaign_data, creator_data)
-            
-            # Generate voice (you can skip this for batch to save API costs)
-            audio_url = f"/api/audio/batch_outreach_{campaign_id}_{creator_id}.mp3"
-            
-            # Store data
-            outreach_data = {
+
+    if background:
+        async def batch_job(ctx):
+            await ctx.set_total(len(creator_ids))
+            results = await run_batch_outreach(campaign_data, creator_ids, on_result=ctx.add_result)
+            return {
                 "campaign_id": campaign_id,
-                "creator_id": creator_id,
-                "outreach_text": email_content,
-                "audio_url": audio_url,
-                "created_at": datetime.now().isoformat()
+                "total_creators": len(creator_ids),
+                "results": results,
+                "success_count": len([r for r in results if r["status"] == "success"])
             }
-            
-            supabase.table("outreach").insert(outreach_data).execute()
-            
-            results.append({
-                "creator_id": creator_id,
-                "status": "success"
-            })
-            
-        except Exception as e:
-            results.append({
-                "creator_id": creator_id,
-                "status": "error",
-                "message": str(e)
-            })
+
+        return await submit_job("batch_outreach", batch_job)
+    
+    results = await run_batch_outreach(campaign_data, creator_ids)
     
     return {
         "campaign_id": campaign_id,
@@ -883,15 +1509,67 @@ async def generate_batch_outreach(campaign_id: str, creator_ids: List[str]):
 
 
 @app.post("/api/negotiations/transcribe")
-async def transcribe_audio(audio_file: UploadFile = File(...)):
-    """Transcribe audio using Whisper API"""
-    transcription = "I think your rate is fair, but I typically charge a bit more for this type of content. Can we discuss the deliverables in more detail?"
-    
-    return {"transcription": transcription}
+async def transcribe_audio(audio_file: UploadFile = File(...), background: bool = False):
+    """Transcribe audio using Whisper API
 
-@app.post("/api/negotiations/respond")
-async def generate_negotiation_response(message: NegotiationMessage):
-    """Generate AI negotiation response"""
+    Long recordings are cut into TRANSCRIPTION_SEGMENT_SECONDS segments that are
+    transcribed in parallel and joined in order.
+    """
+    workdir = tempfile.mkdtemp(prefix="transcribe-", dir=TRANSCRIPTION_SPOOL_DIR)
+    # Whisper tells formats apart by extension
+    suffix = os.path.splitext(audio_file.filename or "")[1].lower()[:8]
+    path = os.path.join(workdir, f"upload{suffix}")
+    try:
+        await spool_upload(audio_file, path, TRANSCRIPTION_MAX_MB * 1024 * 1024)
+    except UploadTooLarge as e:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise HTTPException(status_code=413, detail=str(e))
+    except BaseException:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+
+    async def remove_workdir():
+        await asyncio.to_thread(shutil.rmtree, workdir, True)
+
+    if background:
+        # The job manager removes the workdir however the job ends, even if cancelled while queued
+        try:
+            return await submit_job(
+                "transcription", lambda ctx: transcriber.transcribe_file(path, workdir), cleanup=remove_workdir
+            )
+        except BaseException:
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise
+
+    try:
+        return await transcriber.transcribe_file(path, workdir)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except TranscriptionQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Transcription error: {str(e)}")
+        raise HTTPException(status_code=502, detail="Transcription failed")
+    finally:
+        await remove_workdir()
+
+@app.get("/api/negotiations/transcribe/stats")
+async def get_transcription_stats():
+    """Transcription workers, pending segments and segments transcribed"""
+    return transcriber.stats()
+
+def negotiation_channel(campaign_id: str, creator_id: str) -> str:
+    return f"negotiation:{campaign_id}:{creator_id}"
+
+def negotiation_event(row: dict) -> dict:
+    """What channel subscribers receive for a stored message and its AI reply"""
+    cursor = encode_cursor(row, "created_at") if row.get("id") else None
+    return {"type": "message", "message": row, "cursor": cursor}
+
+async def record_negotiation_message(message: NegotiationMessage) -> dict:
+    """Reply to a negotiation message, store both and push them to channel subscribers"""
     # Simulate GPT-4 negotiation agent
     if message.sender == "creator":
         ai_response = f"I understand your position. We value quality creators and are willing to work within your rate expectations. Let's discuss what deliverables would work best for both parties. We're flexible on timeline and can offer additional exposure through our other channels."
@@ -913,9 +1591,17 @@ async def generate_negotiation_response(message: NegotiationMessage):
     }
     
     try:
-        supabase.table("negotiations").insert(negotiation_data).execute()
+        result = await db.execute(db.table("negotiations").insert(negotiation_data))
+        if result.data:
+            negotiation_data = result.data[0]
     except Exception as e:
         print(f"Failed to store negotiation: {str(e)}")
+
+    try:
+        await broker.publish(negotiation_channel(message.campaign_id, message.creator_id), negotiation_event(negotiation_data))
+    except Exception as e:
+        # Stored all the same; subscribers pick it up when they reconnect with their cursor
+        print(f"Failed to publish negotiation: {str(e)}")
     
     return {
         "response": ai_response,
@@ -923,15 +1609,183 @@ async def generate_negotiation_response(message: NegotiationMessage):
         "sender": "ai_agent"
     }
 
+@app.post("/api/negotiations/respond")
+async def generate_negotiation_response(message: NegotiationMessage):
+    """Generate AI negotiation response"""
+    return await record_negotiation_message(message)
+
+@app.websocket("/api/negotiations/{campaign_id}/{creator_id}/ws")
+async def negotiation_socket(websocket: WebSocket, campaign_id: str, creator_id: str, cursor: Optional[str] = None):
+    """Push negotiation messages and AI replies as they are stored
+
+    With cursor, everything after it is sent first, so a reconnecting client misses
+    nothing. Clients may send {"message": ..., "sender": ...} to post a message. A client
+    that falls NEGOTIATION_WS_QUEUE messages behind is closed with code 1013 and should
+    reconnect with the last cursor it received.
+    """
+    await websocket.accept()
+    # Subscribed before the backlog is read, so nothing stored in between is lost
+    async with broker.subscribe(negotiation_channel(campaign_id, creator_id)) as subscription:
+        sent_ids = set()
+        if cursor:
+            def build_query():
+                return db.table("negotiations").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id)
+
+            try:
+                async for row in iter_rows(db, build_query, "created_at", False, cursor, LIST_PAGE_SIZE):
+                    await websocket.send_json(negotiation_event(row))
+                    sent_ids.add(row["id"])
+            except HTTPException as e:
+                await websocket.close(code=1008, reason=e.detail)
+                return
+            except WebSocketDisconnect:
+                return
+            except Exception as e:
+                print(f"Failed to replay negotiation backlog: {str(e)}")
+                try:
+                    await websocket.send_json({"type": "error", "detail": f"Failed to fetch negotiation history: {str(e)}"})
+                    await websocket.close(code=1011)
+                except (WebSocketDisconnect, RuntimeError):
+                    pass
+                return
+
+        async def push():
+            while True:
+                event = await subscription.get()
+                if event is None:
+                    return True
+                if event["message"].get("id") not in sent_ids:
+                    await websocket.send_json(event)
+
+        async def receive():
+            while True:
+                text = await websocket.receive_text()
+                try:
+                    data = json.loads(text)
+                    message = NegotiationMessage(**{**data, "campaign_id": campaign_id, "creator_id": creator_id})
+                except (ValueError, TypeError) as e:
+                    await websocket.send_json({"type": "error", "detail": str(e)})
+                    continue
+                await record_negotiation_message(message)
+
+        tasks = [asyncio.create_task(push()), asyncio.create_task(receive())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if tasks[0] in done and not tasks[0].cancelled() and tasks[0].exception() is None:
+            await websocket.close(code=1013, reason="Too far behind; reconnect with the last cursor")
+
 @app.get("/api/negotiations/{campaign_id}/{creator_id}")
-async def get_negotiation_history(campaign_id: str, creator_id: str):
+async def get_negotiation_history(
+    campaign_id: str,
+    creator_id: str,
+    sender: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    order: Literal["asc", "desc"] = "asc"
+):
     """Get negotiation conversation history"""
+    check_sort(sort, {"created_at", "id"})
+    select = parse_fields(fields, NEGOTIATION_FIELDS, sort)
+
+    def build_query():
+        query = db.table("negotiations").select(select).eq("campaign_id", campaign_id).eq("creator_id", creator_id)
+        if sender:
+            query = query.eq("sender", sender)
+        return query
+
     try:
-        result = supabase.table("negotiations").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id).execute()
-        return {"messages": result.data}
-    except Exception as e:
+        return await list_from_db("messages", build_query, sort, order, cursor, limit)
+    except HTTPException as e:
+        if e.status_code == 400:
+            raise
         return {"messages": []}
 
+async def get_negotiation_summary_from_db(campaign_id: str, creator_id: str):
+    """Stored rolling summary of a negotiation thread"""
+    try:
+        result = await db.execute(
+            db.table("negotiation_summaries").select("*").eq("campaign_id", campaign_id).eq("creator_id", creator_id)
+        )
+        return result.data[0] if result.data else None
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+async def save_negotiation_summary(summary_data: dict):
+    try:
+        await db.execute(db.table("negotiation_summaries").upsert(summary_data, on_conflict="campaign_id,creator_id"))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+async def refresh_negotiation_summary(campaign_id: str, creator_id: str) -> dict:
+    """Fold messages newer than the stored summary into it, a chunk at a time
+
+    Each LLM call sees only the previous summary and at most NEGOTIATION_SUMMARY_CHUNK
+    messages, so its cost does not grow with the thread. The stored cursor marks the
+    last message folded in and is saved after every chunk.
+    """
+    lock = summary_locks.setdefault((campaign_id, creator_id), asyncio.Lock())
+    async with lock:
+        stored = await get_negotiation_summary_from_db(campaign_id, creator_id) or {
+            "campaign_id": campaign_id,
+            "creator_id": creator_id,
+            "summary": None,
+            "message_count": 0,
+            "cursor": None
+        }
+
+        def build_query():
+            return db.table("negotiations").select("id,sender,message,ai_response,created_at") \
+                .eq("campaign_id", campaign_id).eq("creator_id", creator_id)
+
+        chunk = []
+
+        async def fold():
+            summary = await fold_summary(llm, stored["summary"], chunk, NEGOTIATION_SUMMARY_MAX_TOKENS)
+            stored.update({
+                "summary": summary,
+                "message_count": stored["message_count"] + len(chunk),
+                "cursor": encode_cursor(chunk[-1], "created_at"),
+                "updated_at": datetime.now().isoformat()
+            })
+            await save_negotiation_summary(stored)
+            chunk.clear()
+
+        try:
+            async for row in iter_rows(db, build_query, "created_at", False, stored["cursor"], LIST_PAGE_SIZE):
+                chunk.append(row)
+                if len(chunk) >= NEGOTIATION_SUMMARY_CHUNK:
+                    await fold()
+            if chunk:
+                await fold()
+        except HTTPException:
+            raise
+        except Exception as e:
+            # Whatever was folded in is saved; the rest is picked up next time
+            print(f"Negotiation summary update failed for {campaign_id}/{creator_id}: {str(e)}")
+            return {**stored, "up_to_date": False}
+        return {**stored, "up_to_date": True}
+
+@app.get("/api/negotiations/{campaign_id}/{creator_id}/summary")
+async def get_negotiation_summary(campaign_id: str, creator_id: str, refresh: bool = True):
+    """Rolling summary of a negotiation, brought up to date with any new messages first"""
+    if refresh:
+        summary_data = await refresh_negotiation_summary(campaign_id, creator_id)
+        if not summary_data["summary"] and not summary_data["up_to_date"]:
+            raise HTTPException(status_code=503, detail="Summary could not be generated; try again later")
+    else:
+        summary_data = await get_negotiation_summary_from_db(campaign_id, creator_id)
+    if not summary_data or not summary_data.get("summary"):
+        raise HTTPException(status_code=404, detail="No negotiation messages to summarize")
+    summary_data.pop("cursor", None)
+    return summary_data
+
 # 5. DEAL FINALIZATION ROUTES
 @app.post("/api/deals")
 async def create_deal(deal: DealRequest):
@@ -966,13 +1820,31 @@ async def get_deal(deal_id: str):
     return deal_data
 
 @app.get("/api/deals")
-async def get_all_deals():
+async def get_all_deals(
+    campaign_id: Optional[str] = None,
+    creator_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    order: Literal["asc", "desc"] = "asc"
+):
     """Get all deals"""
-    try:
-        result = supabase.table("deals").select("*").execute()
-        return {"deals": result.data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    check_sort(sort, {"created_at", "id"})
+    select = parse_fields(fields, DEAL_FIELDS, sort)
+
+    def build_query():
+        query = db.table("deals").select(select)
+        if campaign_id:
+            query = query.eq("campaign_id", campaign_id)
+        if creator_id:
+            query = query.eq("creator_id", creator_id)
+        if status:
+            query = query.eq("status", status)
+        return query
+
+    return await list_from_db("deals", build_query, sort, order, cursor, limit)
 
 @app.delete("/api/deals/{deal_id}")
 async def delete_deal(deal_id: str):
@@ -986,6 +1858,63 @@ async def delete_deal(deal_id: str):
 
 
 # 6. CONTRACT GENERATION ROUTES
+async def render_contract(campaign_data: dict, deal_data: dict) -> dict:
+    """Build the contract text and render its PDF in the worker pool, unless it is unchanged"""
+    contract_content = contract_template.render(campaign=campaign_data, deal=deal_data)
+    key = contract_template.key(campaign=campaign_data, deal=deal_data)
+    await contract_renderer.render(contract_content, deal_data["id"], key)
+    return {
+        "contract_text": contract_content,
+        "pdf_url": f"/api/contracts/download/{deal_data['id']}.pdf",
+        "deal_id": deal_data["id"]
+    }
+
+def contract_row(contract: dict) -> dict:
+    return {
+        "deal_id": contract["deal_id"],
+        "contract_text": contract["contract_text"],
+        "pdf_url": contract["pdf_url"],
+        "created_at": datetime.now().isoformat()
+    }
+
+async def run_contract_batch(deal_ids: List[str], on_result=None) -> List[dict]:
+    """Render contracts for many deals in parallel and store them with one bulk insert"""
+    # One batch never queues more renders than there are workers
+    slots = asyncio.Semaphore(contract_renderer.workers)
+
+    async def generate(deal_id: str):
+        result = await generate_one(deal_id)
+        if on_result:
+            await on_result({k: v for k, v in result.items() if k != "contract_text"})
+        return result
+
+    async def generate_one(deal_id: str):
+        try:
+            deal_data = await get_deal_from_db(deal_id)
+            if not deal_data:
+                return {"deal_id": deal_id, "status": "error", "message": "Deal not found"}
+            campaign_data = await get_campaign_from_db(deal_data["campaign_id"])
+            if not campaign_data:
+                return {"deal_id": deal_id, "status": "error", "message": "Campaign not found"}
+            async with slots:
+                contract = await render_contract(campaign_data, deal_data)
+        except HTTPException as e:
+            return {"deal_id": deal_id, "status": "error", "message": e.detail}
+        except Exception as e:
+            return {"deal_id": deal_id, "status": "error", "message": str(e)}
+        return {"status": "success", **contract}
+
+    results = await asyncio.gather(*(generate(deal_id) for deal_id in deal_ids))
+
+    rows = [contract_row(r) for r in results if r["status"] == "success"]
+    if rows:
+        try:
+            await db.execute(db.table("contracts").insert(rows))
+        except Exception as e:
+            print(f"Failed to store contracts: {str(e)}")
+
+    return list(results)
+
 @app.post("/api/contracts/generate")
 async def generate_contract(request: ContractRequest):
     """Generate AI-powered contract PDF"""
@@ -997,59 +1926,82 @@ async def generate_contract(request: ContractRequest):
     if not campaign_data:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
-    # Simulate GPT-4 contract generation
-    contract_content = f"""
-    INFLUENCER MARKETING AGREEMENT
-
-    Campaign: {campaign_data['title']}
-    Platform: {deal_data['platform']}
-    Rate: {deal_data['rate']}
-    Deliverables: {deal_data['deliverables']}
-    Timeline: {deal_data['timeline']}
-
-    Terms and Conditions:
-    1. Content creation and posting requirements
-    2. Usage rights and licensing
-    3. Payment terms and conditions
-    4. Performance metrics and reporting
-    5. Cancellation and modification clauses
-
-    """
-    create_contract_pdf(contract_content, request.deal_id)
-    # Simulate PDF generation
-    pdf_url = f"/api/contracts/download/{request.deal_id}.pdf"
+    try:
+        contract = await render_contract(campaign_data, deal_data)
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     
     # Store contract in database
-    contract_data = {
-        "deal_id": request.deal_id,
-        "contract_text": contract_content,
-        "pdf_url": pdf_url,
-        "created_at": datetime.now().isoformat()
-    }
-    
     try:
-        supabase.table("contracts").insert(contract_data).execute()
+        await db.execute(db.table("contracts").insert(contract_row(contract)))
     except Exception as e:
         print(f"Failed to store contract: {str(e)}")
     
+    return contract
+
+@app.post("/api/contracts/batch")
+async def generate_contract_batch(request: ContractBatchRequest):
+    """Generate contract PDFs for many deals"""
+    if request.background:
+        async def batch_job(ctx):
+            await ctx.set_total(len(request.deal_ids))
+            results = await run_contract_batch(request.deal_ids, on_result=ctx.add_result)
+            return {
+                "total_deals": len(request.deal_ids),
+                "results": results,
+                "success_count": len([r for r in results if r["status"] == "success"])
+            }
+
+        return await submit_job("contract_batch", batch_job)
+
+    results = await run_contract_batch(request.deal_ids)
+
     return {
-        "contract_text": contract_content,
-        "pdf_url": pdf_url,
-        "deal_id": request.deal_id
+        "total_deals": len(request.deal_ids),
+        "results": results,
+        "success_count": len([r for r in results if r["status"] == "success"])
     }
 
 @app.get("/api/contracts/download/{deal_id}.pdf")
-async def download_contract(deal_id: str):
+async def download_contract(deal_id: str, request: Request):
     """Serve actual contract PDF file"""
-    file_path = f"static/contracts/{deal_id}.pdf"
+    file_path = contract_renderer.path_for(deal_id)
     if not os.path.exists(file_path):
         raise HTTPException(status_code=404, detail="PDF not found")
+
+    etag = contract_renderer.etag(deal_id)
+    headers = {"Cache-Control": "no-cache"}
+    if etag:
+        headers["ETag"] = etag
+        if_none_match = request.headers.get("if-none-match", "")
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+
     return FileResponse(
         path=file_path,
         filename=f"Contract_{deal_id}.pdf",
-        media_type="application/pdf"
+        media_type="application/pdf",
+        headers=headers
     )
 
+# 7. BACKGROUND JOB ROUTES
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Get job status, progress and partial results"""
+    job = await jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = await jobs.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"job_id": job_id, "status": job["status"]}
+
 # Health check
 @app.get("/api/health")
 async def health_check():
@@ -0,0 +1,54 @@
+from typing import List, Optional
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of an influencer negotiation. "
+    "Always provide a concise and structured summary."
+)
+
+# A single pasted message should not blow up the prompt
+MAX_MESSAGE_CHARS = 2000
+
+
+def format_messages(rows: List[dict]) -> str:
+    """Transcript lines for stored negotiation rows, each a message and the agent's reply"""
+    lines = []
+    for row in rows:
+        if row.get("message"):
+            lines.append(f"{row.get('sender') or 'unknown'}: {row['message'][:MAX_MESSAGE_CHARS]}")
+        if row.get("ai_response"):
+            lines.append(f"ai_agent: {row['ai_response'][:MAX_MESSAGE_CHARS]}")
+    return "\n".join(lines)
+
+
+def build_summary_prompt(previous_summary: Optional[str], rows: List[dict]) -> str:
+    """Prompt folding new messages into the previous summary, so the full transcript is never re-sent"""
+    previous = previous_summary or "(no summary yet; this is the start of the conversation)"
+    return f"""
+    Update the summary of this influencer negotiation with the new messages.
+
+    Summary so far:
+    {previous}
+
+    New messages:
+    {format_messages(rows)}
+
+    Return the complete updated summary, not just the changes. Include:
+    - Key negotiation points discussed
+    - Agreed rates and deliverables
+    - Timeline and next steps
+    - Overall outcome (deal closed, ongoing, declined)
+    """
+
+
+async def fold_summary(llm, previous_summary: Optional[str], rows: List[dict], max_tokens: int = 500) -> str:
+    """Return the summary after the given rows; raises if the LLM call fails"""
+    response = await llm.chat(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+            {"role": "user", "content": build_summary_prompt(previous_summary, rows)}
+        ],
+        temperature=0.3,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
@@ -0,0 +1,114 @@
+import base64
+import json
+from typing import AsyncIterator, Callable, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def encode_cursor(row: dict, sort: str) -> str:
+    payload = json.dumps({"v": row.get(sort), "id": row.get("id")}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], allowed: Set[str], sort: str) -> str:
+    """Validate a comma separated fields= projection and turn it into a select string"""
+    if not fields:
+        return "*"
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # The cursor is built from the sort column and id, so they are always selected
+    for required in (sort, "id"):
+        if required not in requested:
+            requested.append(required)
+    return ",".join(requested)
+
+
+def check_sort(sort: str, allowed: Set[str]):
+    if sort not in allowed:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sort}; use one of: {', '.join(sorted(allowed))}")
+
+
+def _literal(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return '"' + str(value).replace('"', '\\"') + '"'
+
+
+def apply_keyset(query, sort: str, descending: bool, cursor: Optional[str]):
+    """Order by (sort, id) and continue after the row the cursor points at"""
+    query = query.order(sort, desc=descending)
+    if sort != "id":
+        query = query.order("id", desc=descending)
+    if not cursor:
+        return query
+
+    position = decode_cursor(cursor)
+    op = "lt" if descending else "gt"
+    if sort == "id":
+        return getattr(query, op)("id", position["id"])
+    value = _literal(position["v"])
+    return query.or_(f"{sort}.{op}.{value},and({sort}.eq.{value},id.{op}.{_literal(position['id'])})")
+
+
+async def fetch_page(db, build_query: Callable, sort: str, descending: bool, cursor: Optional[str], limit: int) -> Tuple[List[dict], Optional[str]]:
+    """Fetch one keyset page and the cursor for the next one"""
+    query = apply_keyset(build_query(), sort, descending, cursor).limit(limit + 1)
+    rows = (await db.execute(query)).data
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], sort)
+    return rows, None
+
+
+async def iter_rows(db, build_query: Callable, sort: str, descending: bool, cursor: Optional[str], page_size: int) -> AsyncIterator[dict]:
+    """Yield every matching row, walking the table one keyset page at a time"""
+    while True:
+        rows, cursor = await fetch_page(db, build_query, sort, descending, cursor, page_size)
+        for row in rows:
+            yield row
+        if cursor is None:
+            return
+
+
+def stream_json(rows: AsyncIterator[dict], key: Optional[str] = None) -> StreamingResponse:
+    """Stream rows as a JSON array, or as {key: [...], "next_cursor": null}, as they arrive"""
+    async def body():
+        yield "{" + json.dumps(key) + ": [" if key else "["
+        first = True
+        async for row in rows:
+            yield ("" if first else ",") + json.dumps(row, default=str)
+            first = False
+        yield '], "next_cursor": null}' if key else "]"
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+async def list_response(db, build_query: Callable, key: Optional[str], sort: str, descending: bool, cursor: Optional[str], limit: Optional[int], page_size: int):
+    """One page with its next_cursor when limit is given, otherwise every row streamed page by page"""
+    if limit:
+        rows, next_cursor = await fetch_page(db, build_query, sort, descending, cursor, limit)
+        if key:
+            return JSONResponse({key: rows, "next_cursor": next_cursor})
+        return JSONResponse(rows, headers={"X-Next-Cursor": next_cursor} if next_cursor else {})
+
+    # The first page is fetched up front so that errors still map to a status code
+    rows, next_cursor = await fetch_page(db, build_query, sort, descending, cursor, page_size)
+
+    async def all_rows():
+        for row in rows:
+            yield row
+        if next_cursor:
+            async for row in iter_rows(db, build_query, sort, descending, next_cursor, page_size):
+                yield row
+
+    return stream_json(all_rows(), key)
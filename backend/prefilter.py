@@ -0,0 +1,68 @@
+from typing import Dict, List, Optional, Tuple
+
+from keyword_index import tokenize
+
+# Only what the predicates and the heuristic read; full rows are fetched for the survivors
+PREFILTER_COLUMNS = "id,platform,category,location,engagement_rate"
+
+# Relative weight of each cheap signal in the heuristic score
+HEURISTIC_WEIGHTS = {"semantic": 0.6, "keyword": 0.3, "engagement": 0.1}
+
+# Engagement rates above this (in percent) earn no extra credit
+ENGAGEMENT_CAP = 10.0
+
+
+def platform_predicate(platforms: List[str]) -> Optional[str]:
+    """PostgREST or= expression matching any of the campaign's platforms, case-insensitively"""
+    names = sorted({p.strip().lower() for p in platforms or [] if p and p.strip()})
+    if not names:
+        return None
+    # Commas, parentheses and quotes would break the or= grammar, and no platform name has them
+    names = [n for n in names if not set(n) & set(',()"')]
+    return ",".join(f"platform.ilike.*{name}*" for name in names) or None
+
+
+def campaign_terms(campaign_data: dict, query: str) -> Dict[str, float]:
+    """BM25 query terms for a search: platforms weigh most, then the query, then the brief"""
+    weighted_terms = {}
+    campaign_text = " ".join([
+        campaign_data["title"],
+        campaign_data.get("enhanced_brief") or campaign_data["brief"],
+        campaign_data["audience"]
+    ])
+    for term in tokenize(campaign_text):
+        weighted_terms[term] = 2.0
+    for platform in campaign_data["platforms"]:
+        for term in tokenize(platform):
+            weighted_terms[term] = weighted_terms.get(term, 0.0) + 5.0
+    for term in tokenize(query):
+        weighted_terms[term] = weighted_terms.get(term, 0.0) + 3.0
+    return weighted_terms
+
+
+def rank_candidates(
+    candidates: List[dict],
+    semantic: Dict[str, float],
+    keyword: Dict[str, float]
+) -> List[Tuple[str, float]]:
+    """Order pre-filtered creators by a weighted blend of similarity, BM25 and engagement
+
+    semantic holds cosine similarities and keyword raw BM25 scores, either of which may
+    be empty when its index is unavailable; BM25 is scaled by the best candidate's score.
+    """
+    ids = [c["id"] for c in candidates]
+    top_keyword = max((keyword.get(i, 0.0) for i in ids), default=0.0) or 1.0
+
+    ranked = []
+    for creator in candidates:
+        creator_id = creator["id"]
+        engagement = creator.get("engagement_rate") or 0.0
+        score = (
+            HEURISTIC_WEIGHTS["semantic"] * max(0.0, semantic.get(creator_id, 0.0))
+            + HEURISTIC_WEIGHTS["keyword"] * keyword.get(creator_id, 0.0) / top_keyword
+            + HEURISTIC_WEIGHTS["engagement"] * min(float(engagement), ENGAGEMENT_CAP) / ENGAGEMENT_CAP
+        )
+        ranked.append((creator_id, score))
+    # Ties keep a stable order so a cached search and a fresh one agree
+    ranked.sort(key=lambda item: (-item[1], item[0]))
+    return ranked
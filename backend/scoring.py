@@ -0,0 +1,174 @@
+import asyncio
+import json
+from typing import List
+
+
+class ScoringFailed(Exception):
+    """Raised when no chunk of a scoring run produced usable scores"""
+
+
+def build_scoring_prompt(campaign_data: dict, query: str, creators: List[dict]) -> str:
+    """Prompt asking the LLM to score one chunk of creators against a campaign"""
+    creators_text = ""
+    for idx, creator in enumerate(creators):
+        creators_text += f"""
+        Creator {idx + 1}:
+        - Name: {creator['name']}
+        - Handle: {creator['handle']}
+        - Platform: {creator['platform']}
+        - Followers: {creator['followers']}
+        - Engagement: {creator['engagement']}
+        - Category: {creator['category']}
+        - Location: {creator['location']}
+        - Description: {creator['description']}
+        """
+
+    return f"""
+    You are an elite influencer marketing AI analyst. Analyze this campaign and score ALL creators listed below.
+
+    CAMPAIGN DETAILS:
+    - Title: {campaign_data['title']}
+    - Brief: {campaign_data.get('enhanced_brief') or campaign_data['brief']}
+    - Target Audience: {campaign_data['audience']}
+    - Platforms: {', '.join(campaign_data['platforms'])}
+    - Budget: {campaign_data['budget']}
+    - Search Query: {query}
+
+    CREATORS TO ANALYZE:
+    {creators_text}
+
+    SCORING CRITERIA (Total 100 points):
+    1. Audience Alignment (0-25): How well their audience matches target demographics
+    2. Content Relevance (0-25): Alignment with content themes and industry vertical
+    3. Platform Optimization (0-20): Platform expertise and content format mastery
+    4. Engagement Quality (0-15): Authentic engagement vs follower count ratio
+    5. Brand Safety (0-10): Professional reputation and content appropriateness
+    6. Geographic Relevance (0-5): Location alignment with campaign needs
+
+    ADDITIONAL SCORING FACTORS:
+    - Growth Potential Bonus: High (+10), Medium (+5), Low (0)
+    - Collaboration Fit Bonus: Excellent (+15), Good (+10), Fair (+5), Poor (0)
+    - Performance Bonus: Above Average (+8), Average (+4), Below Average (0)
+    - Risk Penalty: -3 per risk factor
+
+    Return a JSON object with this EXACT structure:
+    {{
+        "campaign_requirements": {{
+            "target_demographics": ["demographic1", "demographic2"],
+            "content_style": ["style1", "style2"],
+            "industry_vertical": "primary industry",
+            "platform_priorities": ["platform1", "platform2"],
+            "content_themes": ["theme1", "theme2", "theme3"]
+        }},
+        "creator_scores": [
+            {{
+                "creator_index": 0,
+                "match_score": 85,
+                "detailed_scores": {{
+                    "audience_alignment": 22,
+                    "content_relevance": 20,
+                    "platform_optimization": 18,
+                    "engagement_quality": 14,
+                    "brand_safety": 8,
+                    "geographic_relevance": 3
+                }},
+                "bonuses": {{
+                    "growth_potential": 10,
+                    "collaboration_fit": 15,
+                    "performance": 8
+                }},
+                "penalties": {{
+                    "risk_factors": 0
+                }},
+                "strengths": ["strength1", "strength2"],
+                "collaboration_fit": "excellent",
+                "growth_potential": "high",
+                "estimated_performance": "above_average",
+                "risk_factors": [],
+                "optimal_content_types": ["content_type1", "content_type2"]
+            }}
+        ],
+        "semantic_matches": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]
+    }}
+
+    IMPORTANT: 
+    - Score ALL creators provided (creator_index 0 to {len(creators)-1})
+    - Calculate match_score as: base_score + bonuses - penalties (max 100)
+    - Include 5-7 semantic keywords that represent the search intent
+    - Ensure valid JSON format
+    """
+
+
+def _parse_chunk(content: str, size: int) -> dict:
+    analysis = json.loads(content.strip())
+    scores = []
+    for score_data in analysis.get("creator_scores", []):
+        index = score_data.get("creator_index")
+        if isinstance(index, int) and 0 <= index < size:
+            scores.append(score_data)
+    if not scores:
+        raise ValueError("No usable creator_scores in response")
+    analysis["creator_scores"] = scores
+    return analysis
+
+
+async def _score_chunk(llm, campaign_data: dict, query: str, creators: List[dict]) -> dict:
+    request = dict(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are a precise influencer analytics AI. Always return valid JSON only. No explanations or additional text."},
+            {"role": "user", "content": build_scoring_prompt(campaign_data, query, creators)}
+        ],
+        temperature=0.1,
+        max_tokens=4000
+    )
+    response = await llm.chat(memoize=True, **request)
+    try:
+        return _parse_chunk(response.choices[0].message.content, len(creators))
+    except Exception:
+        # A retry must reach the model rather than replay the same bad answer
+        await llm.forget(**request)
+        raise
+
+
+async def score_creators(llm, campaign_data: dict, query: str, creators: List[dict], chunk_size: int = 10, retries: int = 1) -> dict:
+    """Score creators in concurrent fixed-size chunks, retrying only the chunks that fail"""
+    offsets = list(range(0, len(creators), chunk_size))
+    analyses = {}
+    pending = offsets
+
+    for attempt in range(retries + 1):
+        outcomes = await asyncio.gather(
+            *(_score_chunk(llm, campaign_data, query, creators[offset:offset + chunk_size]) for offset in pending),
+            return_exceptions=True
+        )
+        failed = []
+        for offset, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Scoring chunk at {offset} failed (attempt {attempt + 1}): {str(outcome)}")
+                failed.append(offset)
+            else:
+                analyses[offset] = outcome
+        pending = failed
+        if not pending:
+            break
+
+    if not analyses:
+        raise ScoringFailed(f"All {len(offsets)} scoring chunks failed")
+
+    # Remap chunk-local creator_index values back to positions in creators
+    creator_scores = []
+    semantic_matches = []
+    for offset in sorted(analyses):
+        for score_data in analyses[offset]["creator_scores"]:
+            creator_scores.append({**score_data, "creator_index": offset + score_data["creator_index"]})
+        for keyword in analyses[offset].get("semantic_matches", []):
+            if keyword not in semantic_matches:
+                semantic_matches.append(keyword)
+
+    return {
+        "campaign_requirements": analyses[min(analyses)].get("campaign_requirements", {}),
+        "creator_scores": creator_scores,
+        "semantic_matches": semantic_matches[:7],
+        "failed_chunks": len(pending)
+    }
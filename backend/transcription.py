@@ -0,0 +1,189 @@
+import asyncio
+import os
+import shutil
+import wave
+from typing import List, Optional, Tuple
+
+# Whisper rejects uploads above 25 MB
+MAX_SEGMENT_BYTES = 25 * 1024 * 1024
+
+# Room left in each WAV segment for its header
+WAV_HEADER_BYTES = 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload or an unsplittable recording exceeds its size limit"""
+
+
+class TranscriptionQueueFull(Exception):
+    """Raised when too many segments are already waiting for a transcription worker"""
+
+
+async def spool_upload(upload, path: str, max_bytes: int, chunk_size: int = 1024 * 1024) -> int:
+    """Copy an upload to path a chunk at a time; returns the bytes written"""
+    written = 0
+    with open(path, "wb") as f:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadTooLarge(f"Audio larger than {max_bytes // (1024 * 1024)} MB")
+            await asyncio.to_thread(f.write, chunk)
+    return written
+
+
+def _wav_seconds(path: str) -> float:
+    with wave.open(path, "rb") as segment:
+        return segment.getnframes() / segment.getframerate()
+
+
+async def _split_with_ffmpeg(path: str, directory: str, segment_seconds: int) -> List[Tuple[str, float]]:
+    # Re-encoded to 16 kHz mono PCM, which Whisper reads as-is and keeps segments well under its limit
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error", "-i", path,
+        "-vn", "-ac", "1", "-ar", "16000", "-c:a", "pcm_s16le",
+        "-f", "segment", "-segment_time", str(segment_seconds),
+        os.path.join(directory, "segment-%04d.wav"),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise ValueError(f"Could not decode audio: {stderr.decode(errors='replace').strip()[-300:]}")
+    segments = sorted(
+        os.path.join(directory, name) for name in os.listdir(directory) if name.startswith("segment-")
+    )
+    # ffmpeg cuts at packet boundaries, so each segment's real length is read back from its header
+    return [(segment, await asyncio.to_thread(_wav_seconds, segment)) for segment in segments]
+
+
+def _split_wav(path: str, directory: str, segment_seconds: int) -> Optional[List[Tuple[str, float]]]:
+    """Split a WAV file by frame count without ffmpeg into (path, seconds) pairs; None if not a WAV file"""
+    try:
+        source = wave.open(path, "rb")
+    except (wave.Error, EOFError):
+        return None
+    segments = []
+    with source:
+        # High sample rates or many channels shorten segments so each stays under Whisper's limit
+        frame_bytes = source.getnchannels() * source.getsampwidth()
+        frames_per_segment = min(
+            source.getframerate() * segment_seconds,
+            (MAX_SEGMENT_BYTES - WAV_HEADER_BYTES) // frame_bytes
+        )
+        while True:
+            frames = source.readframes(frames_per_segment)
+            if not frames:
+                break
+            segment_path = os.path.join(directory, f"segment-{len(segments):04d}.wav")
+            with wave.open(segment_path, "wb") as segment:
+                segment.setparams(source.getparams())
+                segment.writeframes(frames)
+            segments.append((segment_path, len(frames) / frame_bytes / source.getframerate()))
+    return segments
+
+
+async def split_audio(path: str, directory: str, segment_seconds: int) -> List[Tuple[str, Optional[float]]]:
+    """(path, seconds) of segments of at most segment_seconds each, in playback order
+
+    The length is None for a recording passed through whole, which is then the only segment.
+    """
+    if shutil.which("ffmpeg"):
+        return await _split_with_ffmpeg(path, directory, segment_seconds)
+    segments = await asyncio.to_thread(_split_wav, path, directory, segment_seconds)
+    if segments is not None:
+        return segments
+    # Other formats cannot be cut without ffmpeg, so they go through whole if Whisper will take them
+    if os.path.getsize(path) > MAX_SEGMENT_BYTES:
+        raise UploadTooLarge("Recordings over 25 MB need ffmpeg installed to be split")
+    return [(path, None)]
+
+
+class WhisperBackend:
+    """Transcribes through the shared OpenAI gateway"""
+
+    def __init__(self, llm, model: str = "whisper-1"):
+        self.llm = llm
+        self.model = model
+        self.name = model
+
+    async def transcribe(self, path: str) -> str:
+        return await self.llm.transcribe(path, model=self.model)
+
+
+class FakeTranscriptionBackend:
+    """Offline stand-in that describes each segment instead of transcribing it"""
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    async def transcribe(self, path: str) -> str:
+        await asyncio.sleep(self.latency)
+        return f"[{os.path.basename(path)}: {os.path.getsize(path)} bytes]"
+
+
+class TranscriptionPipeline:
+    """Splits recordings into segments and transcribes them on a bounded set of workers"""
+
+    def __init__(self, backend, workers: int = 4, queue_size: int = 64, segment_seconds: int = 300):
+        self.backend = backend
+        self.workers = workers
+        self.queue_size = queue_size
+        self.segment_seconds = segment_seconds
+        self.transcribed_segments = 0
+        self._slots = asyncio.Semaphore(workers)
+        self._pending = 0
+
+    async def _transcribe_segment(self, path: str) -> str:
+        async with self._slots:
+            text = await self.backend.transcribe(path)
+        self.transcribed_segments += 1
+        return text.strip()
+
+    def _release(self, task: asyncio.Task):
+        # A done callback, so segments cancelled before they start are released too
+        self._pending -= 1
+
+    async def transcribe_file(self, path: str, directory: str) -> dict:
+        """Transcribe the recording at path, using directory for its segments"""
+        segments = await split_audio(path, directory, self.segment_seconds)
+        if self._pending + len(segments) > self.workers + self.queue_size:
+            raise TranscriptionQueueFull(f"{self._pending} audio segments already pending")
+        self._pending += len(segments)
+        tasks = [asyncio.create_task(self._transcribe_segment(segment)) for segment, _ in segments]
+        for task in tasks:
+            task.add_done_callback(self._release)
+        try:
+            # Segments run in parallel; gather keeps their results in playback order
+            texts = await asyncio.gather(*tasks)
+        except BaseException:
+            # One failed segment fails the recording, so the rest stop before its files are removed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        # Segments can be shorter than segment_seconds, so offsets add up the real lengths
+        starts, elapsed = [], 0.0
+        for _, seconds in segments:
+            starts.append(round(elapsed, 3))
+            elapsed += seconds or 0.0
+        return {
+            "transcription": " ".join(text for text in texts if text),
+            "segments": [
+                {"index": i, "start": start, "text": text}
+                for i, (start, text) in enumerate(zip(starts, texts))
+            ]
+        }
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self._pending,
+            "transcribed_segments": self.transcribed_segments
+        }
@@ -0,0 +1,76 @@
+import asyncio
+import os
+from typing import Optional
+
+import httpx
+
+from metrics import track_dependency
+
+
+class TTSError(Exception):
+    """Raised when ElevenLabs does not return audio"""
+
+
+class TTSClient:
+    """Async ElevenLabs client that streams synthesized audio straight to disk"""
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str = "https://api.elevenlabs.io/v1",
+        max_in_flight: int = 4,
+        timeout: float = 30.0,
+        total_timeout: float = 90.0,
+        chunk_size: int = 16384
+    ):
+        self.api_key = api_key
+        self.total_timeout = total_timeout
+        self.chunk_size = chunk_size
+        self._http = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(max_connections=max_in_flight, max_keepalive_connections=max_in_flight)
+        )
+        # Slow synthesis must not pile up sockets and open files
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def close(self):
+        await self._http.aclose()
+
+    async def _stream_to_file(self, payload: dict, voice_id: str, path: str) -> int:
+        headers = {
+            "Accept": "audio/mpeg",
+            "Content-Type": "application/json",
+            "xi-api-key": self.api_key or ""
+        }
+        async with self._http.stream("POST", f"/text-to-speech/{voice_id}/stream", json=payload, headers=headers) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                raise TTSError(f"ElevenLabs API error: {response.status_code} - {body[:500].decode(errors='replace')}")
+
+            written = 0
+            with open(path, "wb") as f:
+                async for chunk in response.aiter_bytes(self.chunk_size):
+                    await asyncio.to_thread(f.write, chunk)
+                    written += len(chunk)
+            return written
+
+    async def synthesize_to_file(self, text: str, path: str, voice_id: str, model_id: str, voice_settings: dict) -> int:
+        """Synthesize text into path; returns the number of bytes written"""
+        payload = {
+            "text": text,
+            "model_id": model_id,
+            "voice_settings": voice_settings
+        }
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        part_path = f"{path}.part"
+        async with self._slots:
+            try:
+                with track_dependency("elevenlabs", "text_to_speech"):
+                    written = await asyncio.wait_for(self._stream_to_file(payload, voice_id, part_path), self.total_timeout)
+            except BaseException:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                raise
+        os.replace(part_path, path)
+        return written
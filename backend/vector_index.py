@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+
+def creator_document(creator: dict) -> str:
+    """Text that represents a creator in the embedding space"""
+    return " ".join(str(creator.get(field) or "") for field in (
+        "name", "handle", "category", "platform", "location", "description"
+    ))
+
+
+class HashingEmbedder:
+    """Local feature-hashing embedder; needs no network or model download"""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = re.findall(r"[a-z0-9]+", text.lower())
+        # Unigrams plus bigrams so that short phrases carry some order
+        for token in tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]:
+            digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dim
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[bucket] += sign
+        return vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return np.stack([self._embed_one(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+
+class OpenAIEmbedder:
+    """Embeds texts through the shared LLM gateway"""
+
+    def __init__(self, llm, model: str = "text-embedding-3-small", batch_size: int = 256):
+        self.llm = llm
+        self.model = model
+        self.batch_size = batch_size
+        self.name = f"openai-{model}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self.llm.embed(batch, model=self.model) for batch in batches))
+        vectors = [v for batch in results for v in batch]
+        return np.asarray(vectors, dtype=np.float32)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class CreatorVectorIndex:
+    """Creator embedding index with exact NumPy cosine top-k and an optional HNSW backend"""
+
+    def __init__(self, embedder, path: Optional[str] = None, ann: bool = False):
+        self.embedder = embedder
+        self.path = path
+        self.ann = ann and hnswlib is not None
+        self.ids: List[str] = []
+        self.vectors: Optional[np.ndarray] = None
+        self.ready = False
+        self._positions: Dict[str, int] = {}
+        self._hnsw = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def load(self) -> bool:
+        """Load a previously saved index; ignored if it was built by another embedder"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            data = np.load(self.path, allow_pickle=False)
+            if str(data["embedder"]) != self.embedder.name:
+                return False
+            self._set(list(data["ids"]), data["vectors"])
+        except Exception as e:
+            print(f"Failed to load creator index: {str(e)}")
+            return False
+        return True
+
+    def _save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            ids=np.asarray(self.ids, dtype=str),
+            vectors=self.vectors,
+            embedder=np.asarray(self.embedder.name)
+        )
+        os.replace(tmp_path, self.path)
+
+    async def save(self):
+        await asyncio.to_thread(self._save)
+
+    def _set(self, ids: List[str], vectors: np.ndarray):
+        self.ids = ids
+        self.vectors = vectors.astype(np.float32) if len(ids) else None
+        self._positions = {creator_id: i for i, creator_id in enumerate(ids)}
+        self._hnsw = None
+        self.ready = True
+
+    async def build(self, creators: List[dict]):
+        """Embed the whole roster and replace the index"""
+        vectors = await self.embedder.embed([creator_document(c) for c in creators])
+        async with self._lock:
+            self._set([c["id"] for c in creators], _normalize(vectors) if len(creators) else vectors)
+            await self.save()
+
+    async def upsert(self, creators: List[dict], save: bool = True):
+        """Add or replace creators without rebuilding the rest of the index"""
+        if not self.ready or not creators:
+            return
+        vectors = _normalize(await self.embedder.embed([creator_document(c) for c in creators]))
+        async with self._lock:
+            ids = list(self.ids)
+            matrix = self.vectors if self.vectors is not None else np.zeros((0, vectors.shape[1]), dtype=np.float32)
+            new_rows = []
+            for creator, vector in zip(creators, vectors):
+                position = self._positions.get(creator["id"])
+                if position is not None:
+                    matrix[position] = vector
+                else:
+                    ids.append(creator["id"])
+                    new_rows.append(vector)
+            if new_rows:
+                matrix = np.vstack([matrix, np.stack(new_rows)])
+            self._set(ids, matrix)
+            if save:
+                await self.save()
+
+    async def remove(self, creator_ids: List[str]):
+        """Drop creators from the index"""
+        if not self.ready:
+            return
+        async with self._lock:
+            drop = {cid for cid in creator_ids if cid in self._positions}
+            if not drop:
+                return
+            keep = [i for i, cid in enumerate(self.ids) if cid not in drop]
+            self._set([self.ids[i] for i in keep], self.vectors[keep] if keep else np.zeros((0, 0), dtype=np.float32))
+            await self.save()
+
+    def _ann_index(self):
+        if self._hnsw is None:
+            index = hnswlib.Index(space="cosine", dim=self.vectors.shape[1])
+            index.init_index(max_elements=len(self.ids), ef_construction=200, M=16)
+            index.add_items(self.vectors, np.arange(len(self.ids)))
+            self._hnsw = index
+        return self._hnsw
+
+    async def search(self, text: str, k: int, ids: Optional[List[str]] = None) -> List[Tuple[str, float]]:
+        """Return up to k (creator_id, cosine similarity) pairs, best first, optionally only among ids"""
+        if not self.ready or self.vectors is None or not len(self.ids):
+            return []
+        allowed = None
+        if ids is not None:
+            allowed = np.fromiter((self._positions[cid] for cid in ids if cid in self._positions), dtype=np.int64)
+            if not len(allowed):
+                return []
+        query = _normalize(await self.embedder.embed([text]))[0]
+        k = min(k, len(self.ids) if allowed is None else len(allowed))
+
+        if self.ann:
+            index = self._ann_index()
+            index.set_ef(max(k * 2, 50))
+            try:
+                if allowed is None:
+                    labels, distances = index.knn_query(query, k=k)
+                else:
+                    positions = set(allowed.tolist())
+                    labels, distances = index.knn_query(query, k=k, filter=lambda label: label in positions)
+                return [(self.ids[int(l)], float(1 - d)) for l, d in zip(labels[0], distances[0])]
+            except RuntimeError:
+                # A very selective filter can leave the graph search short of k; fall back to exact
+                pass
+
+        scores = (self.vectors if allowed is None else self.vectors[allowed]) @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        positions = top if allowed is None else allowed[top]
+        return [(self.ids[p], float(scores[i])) for p, i in zip(positions, top)]
@@ -79,37 +79,49 @@ export type Database = {
           category: string
           created_at: string | null
           description: string
+          engaged_followers: number | null
           engagement: string
+          engagement_rate: number | null
           followers: string
+          followers_count: number | null
           handle: string
           id: string
           location: string
           name: string
           platform: string
+          tier: string | null
         }
         Insert: {
           category: string
           created_at?: string | null
           description: string
+          engaged_followers?: number | null
           engagement: string
+          engagement_rate?: number | null
           followers: string
+          followers_count?: number | null
           handle: string
           id?: string
           location: string
           name: string
           platform: string
+          tier?: string | null
         }
         Update: {
           category?: string
           created_at?: string | null
           description?: string
+          engaged_followers?: number | null
           engagement?: string
+          engagement_rate?: number | null
           followers?: string
+          followers_count?: number | null
           handle?: string
           id?: string
           location?: string
           name?: string
           platform?: string
+          tier?: string | null
         }
         Relationships: []
       }
@@ -164,33 +176,63 @@ export type Database = {
           },
         ]
       }
+      negotiation_summaries: {
+        Row: {
+          campaign_id: string
+          creator_id: string
+          cursor: string | null
+          message_count: number
+          summary: string | null
+          updated_at: string
+        }
+        Insert: {
+          campaign_id: string
+          creator_id: string
+          cursor?: string | null
+          message_count?: number
+          summary?: string | null
+          updated_at?: string
+        }
+        Update: {
+          campaign_id?: string
+          creator_id?: string
+          cursor?: string | null
+          message_count?: number
+          summary?: string | null
+          updated_at?: string
+        }
+        Relationships: []
+      }
       negotiations: {
         Row: {
+          ai_response: string | null
+          audio_url: string | null
           campaign_id: string | null
           created_at: string | null
           creator_id: string | null
           id: string
-          message_text: string
+          message: string
           sender: string
-          voice_url: string | null
         }
         Insert: {
+          ai_response?: string | null
+          audio_url?: string | null
           campaign_id?: string | null
           created_at?: string | null
           creator_id?: string | null
           id?: string
-          message_text: string
+          message: string
           sender: string
-          voice_url?: string | null
         }
         Update: {
+          ai_response?: string | null
+          audio_url?: string | null
           campaign_id?: string | null
           created_at?: string | null
           creator_id?: string | null
           id?: string
-          message_text?: string
+          message?: string
           sender?: string
-          voice_url?: string | null
         }
         Relationships: [
           {
@@ -157,6 +157,19 @@ class ApiService {
     return this.request(`/negotiations/${campaignId}/${creatorId}`);
   }
 
+  // Pushes each stored message and AI reply instead of polling the history;
+  // pass the last cursor received to catch up after a reconnect
+  subscribeToNegotiation(campaignId: string, creatorId: string, onEvent: (event: any) => void, cursor?: string) {
+    const url = new URL(`${API_BASE_URL}/negotiations/${campaignId}/${creatorId}/ws`);
+    url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:';
+    if (cursor) {
+      url.searchParams.set('cursor', cursor);
+    }
+    const socket = new WebSocket(url.toString());
+    socket.onmessage = (message) => onEvent(JSON.parse(message.data));
+    return socket;
+  }
+
   async transcribeAudio(audioFile: File) {
     const formData = new FormData();
     formData.append('audio_file', audioFile);
@@ -0,0 +1,77 @@
+-- Numeric creator metrics parsed from the free-form followers/engagement text.
+-- The backend computes these on every write (backend/creator_metrics.py); the
+-- functions below mirror that parser so existing rows can be backfilled here.
+
+alter table public.creators
+    add column if not exists followers_count bigint,
+    add column if not exists engagement_rate numeric(7, 3),
+    add column if not exists engaged_followers bigint,
+    add column if not exists tier text;
+
+create or replace function public.parse_follower_count(value text)
+returns bigint
+language plpgsql
+immutable
+as $$
+declare
+    parts text[];
+    multiplier numeric;
+begin
+    parts := regexp_match(
+        lower(coalesce(value, '')),
+        '^\s*([0-9][0-9,]*(?:\.[0-9]+)?)\s*([a-z]*)\s*\+?\s*(?:followers|subscribers|subs)?\s*$'
+    );
+    if parts is null then
+        return null;
+    end if;
+    multiplier := case parts[2]
+        when '' then 1
+        when 'k' then 1e3 when 'thousand' then 1e3
+        when 'm' then 1e6 when 'mn' then 1e6 when 'million' then 1e6
+        when 'b' then 1e9 when 'bn' then 1e9 when 'billion' then 1e9
+        when 'l' then 1e5 when 'lac' then 1e5 when 'lakh' then 1e5 when 'lakhs' then 1e5
+        when 'cr' then 1e7 when 'crore' then 1e7 when 'crores' then 1e7
+    end;
+    if multiplier is null then
+        return null;
+    end if;
+    return round(replace(parts[1], ',', '')::numeric * multiplier)::bigint;
+end;
+$$;
+
+create or replace function public.parse_engagement_rate(value text)
+returns numeric
+language sql
+immutable
+as $$
+    select (regexp_match(coalesce(value, ''), '^\s*([0-9]+(?:\.[0-9]+)?)\s*%?\s*$'))[1]::numeric
+$$;
+
+with parsed as (
+    select
+        id,
+        public.parse_follower_count(followers) as followers_count,
+        public.parse_engagement_rate(engagement) as engagement_rate
+    from public.creators
+)
+update public.creators c
+set
+    followers_count = p.followers_count,
+    engagement_rate = p.engagement_rate,
+    engaged_followers = floor(p.followers_count * p.engagement_rate / 100)::bigint,
+    tier = case
+        when p.followers_count is null then null
+        when p.followers_count >= 1000000 then 'mega'
+        when p.followers_count >= 500000 then 'macro'
+        when p.followers_count >= 100000 then 'mid'
+        when p.followers_count >= 10000 then 'micro'
+        else 'nano'
+    end
+from parsed p
+where c.id = p.id;
+
+-- Range filters and metric sorts on GET /api/creators; id breaks ties for keyset paging
+create index if not exists creators_followers_count_idx on public.creators (followers_count, id);
+create index if not exists creators_engagement_rate_idx on public.creators (engagement_rate, id);
+create index if not exists creators_engaged_followers_idx on public.creators (engaged_followers, id);
+create index if not exists creators_tier_idx on public.creators (tier);
@@ -0,0 +1,18 @@
+-- Rolling per-thread negotiation summaries, maintained by
+-- GET /api/negotiations/{campaign_id}/{creator_id}/summary
+
+create table if not exists public.negotiation_summaries (
+    campaign_id text not null,
+    creator_id text not null,
+    summary text,
+    -- Messages folded into the summary so far
+    message_count integer not null default 0,
+    -- Keyset cursor (created_at, id) of the last message folded in
+    cursor text,
+    updated_at timestamptz not null default now(),
+    primary key (campaign_id, creator_id)
+);
+
+-- Thread history is read in (created_at, id) order, both for paging and for summary updates
+create index if not exists negotiations_thread_idx
+    on public.negotiations (campaign_id, creator_id, created_at, id);
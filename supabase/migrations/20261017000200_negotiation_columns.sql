@@ -0,0 +1,24 @@
+-- The backend has always written negotiations as message / ai_response / audio_url
+-- (backend/main.py record_negotiation_message), while the table was created with
+-- message_text / voice_url and no column for the agent's reply, so every insert
+-- failed. Rename the columns to what the backend reads and writes and add the reply.
+
+do $$
+begin
+    if exists (
+        select 1 from information_schema.columns
+        where table_schema = 'public' and table_name = 'negotiations' and column_name = 'message_text'
+    ) then
+        alter table public.negotiations rename column message_text to message;
+    end if;
+    if exists (
+        select 1 from information_schema.columns
+        where table_schema = 'public' and table_name = 'negotiations' and column_name = 'voice_url'
+    ) then
+        alter table public.negotiations rename column voice_url to audio_url;
+    end if;
+end
+$$;
+
+alter table public.negotiations
+    add column if not exists ai_response text;